@@ -1,88 +1,220 @@
 # minesweeper/ai/ai.py
+import math
 import random
-from collections import defaultdict, deque
+from collections import defaultdict
+
+from .counting import solve_component, convolve, log_factorials, CountTable
+from .cache import canonical_key
+from .linalg import linear_forced
+from .sampling import sample_component, SampledCounts
+from .stats import clock
 
 # Lưu ý: Không dùng typing kiểu mới để tương thích Python 3.8+
 
+# Ràng buộc được mã hóa dạng (mask, sum): bit i của mask <-> biến thứ i của frontier
+# (self._cells[i]). Subset/hiệu/khử trùng lặp đều là phép toán số nguyên.
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:  # Python < 3.10
+    def _popcount(m): return bin(m).count("1")
+
+def _bits(m):
+    # liệt kê chỉ số các bit 1 của m
+    while m:
+        low = m & -m
+        yield low.bit_length() - 1
+        m ^= low
+
 class MinesweeperAI:
     """
-    AI Minesweeper: CSP + subset + exact enumeration theo thành phần nhỏ.
+    AI Minesweeper: CSP + subset + đếm nghiệm chính xác (DP) theo từng thành phần.
     Giao diện:
       - next_actions(board) -> {"flags": [(r,c),...], "reveal": [(r,c),...]}
       - guess(board) -> (r,c)  # gọi sau next_actions nếu chưa có nước đi chắc chắn
     """
 
-    def __init__(self, enum_limit=16):
-        # Số biến tối đa trong 1 component để liệt kê nghiệm chính xác (an toàn & nhanh).
+    def __init__(self, enum_limit=None, state_limit=20000, rng=None, stats=None, cache=None,
+                 linalg_limit=600, mc_samples=200, mc_budget_ms=None, mc_min_ess=50):
+        # Số biến tối đa trong 1 component để đếm nghiệm chính xác (DP theo frontier); None = không
+        # giới hạn: chi phí DP tùy độ rộng frontier chứ không tùy số biến, nên chỉ state_limit quyết định.
         self.enum_limit = enum_limit
+        # Số trạng thái DP tối đa trên 1 tầng; vượt quá thì bỏ qua component (như vượt enum_limit).
+        self.state_limit = state_limit
+        # Số biến tối đa trong 1 component cho bước khử Gauss trước DP (0 = tắt bước này).
+        self.linalg_limit = linalg_limit
+        # Component bị bỏ qua ở trên được ước lượng bằng lấy mẫu (ai.sampling): tối đa mc_samples
+        # mẫu mỗi component (mặc định = config.AI), ngân sách mc_budget_ms mỗi bước chia đều cho các
+        # component (None = không giới hạn giờ, kết quả tái lập được). Cỡ mẫu hiệu dụng < mc_min_ess
+        # thì coi như không ước lượng được.
+        self.mc_samples = mc_samples
+        self.mc_budget_ms = mc_budget_ms
+        self.mc_min_ess = mc_min_ess
+        # ô -> (cận dưới, cận trên) khoảng tin cậy P(mìn) cho các ô chỉ có xác suất ước lượng
+        self.intervals = {}
+        # RNG cho các lượt đoán: seed (int) | random.Random | None (lấy seed từ module random)
+        if isinstance(rng, random.Random):
+            self.rng = rng
+        else:
+            self.rng = random.Random(random.getrandbits(63) if rng is None else rng)
         self._best_guess = None  # ghi nhớ sau next_actions
+        # ai.stats.AIStats để đo từng pha của next_actions; None = tắt (mặc định)
+        self.stats = stats
+        # ai.cache.ComponentCache dùng chung giữa các AI/ván; None = luôn đếm lại bằng DP
+        self.cache = cache
+
+        # Frontier bền vững: ô số đã mở -> (frozenset ô ẩn kề, số mìn còn lại).
+        # Chỉ cập nhật các ô bị ảnh hưởng theo board.changes, không quét lại cả bàn.
+        self._board = None
+        self._epoch = None
+        self._log_pos = 0
+        self._cons = {}
 
     # ----------------- PUBLIC API -----------------
     def next_actions(self, board):
         self._best_guess = None
+        self.intervals = {}
+        st = self.stats
+        if st is not None:
+            st.steps += 1
+            t = clock()
 
         # 1) Thu ràng buộc từ các ô số đã mở
-        constraints = self._build_constraints(board)  # list[{"vars": set[(r,c)], "sum": int}]
+        constraints = self._build_constraints(board)  # list[(mask, sum)], bit -> self._cells
+        if st is not None:
+            t = st.add_time("build", t)
+            st.constraints += len(constraints)
+            st.max_constraints = max(st.max_constraints, len(constraints))
+            rounds = 0
 
         # 2) Lặp suy luận đơn + subset tới bão hòa
-        known_safe = set()
-        known_mine = set()
+        known_safe = 0
+        known_mine = 0
         changed = True
         while changed:
             changed = False
+            if st is not None:
+                rounds += 1
 
             # 2.1 single-point: nếu sum==0 -> tất cả SAFE; nếu sum==|vars| -> tất cả MINE
             safes, mines = self._trivial(constraints)
             if safes or mines:
                 changed = True
-                known_safe.update(safes)
-                known_mine.update(mines)
-                self._apply_known(constraints, safes, mines)
+                known_safe |= safes
+                known_mine |= mines
+                constraints = self._apply_known(constraints, safes, mines)
 
             # 2.2 subset inference: A ⊂ B ⇒ B\A có tổng = sum(B)-sum(A)
-            if self._subset_infer(constraints, known_safe, known_mine):
+            derived = self._subset_infer(constraints)
+            if derived:
                 changed = True
+                if st is not None:
+                    st.derived += len(derived)
+                constraints = self._dedup(constraints + derived)
                 # sau khi sinh thêm ràng buộc đơn, áp lại trivial
                 safes, mines = self._trivial(constraints)
                 if safes or mines:
-                    known_safe.update(safes)
-                    known_mine.update(mines)
-                    self._apply_known(constraints, safes, mines)
-                    changed = True
-
+                    known_safe |= safes
+                    known_mine |= mines
+                    constraints = self._apply_known(constraints, safes, mines)
+
+        if st is not None:
+            t = st.add_time("saturate", t)
+            st.rounds += rounds
+            st.max_rounds = max(st.max_rounds, rounds)
         if known_safe or known_mine:
-            return {"flags": sorted(list(known_mine)), "reveal": sorted(list(known_safe))}
+            if st is not None:
+                st.solved += 1
+            return {"flags": self._to_cells(known_mine), "reveal": self._to_cells(known_safe)}
 
         # 3) Chia thành phần độc lập theo biến giao nhau
         comps = self._components(constraints)
-
-        # 4) Exact enumeration trên component nhỏ -> tính P(mine) cho từng biến
-        probs = {}
-        for comp_constraints, comp_vars in comps:
-            k = len(comp_vars)
+        if st is not None:
+            t = st.add_time("components", t)
+
+        # 3b) Khử Gauss + xét cận trên từng component: ô chắc chắn mà subset (từng cặp) bỏ sót
+        lin_safe, lin_mine = self._linear_infer(comps)
+        if st is not None:
+            t = st.add_time("linalg", t)
+        if lin_safe or lin_mine:
+            if st is not None:
+                st.linear += 1
+            return {"flags": self._to_cells(lin_mine), "reveal": self._to_cells(lin_safe)}
+
+        # 4) Đếm nghiệm chính xác (DP) trên từng component, theo tổng số mìn T
+        counted = []
+        too_big = []
+        for comp_constraints, comp_mask in comps:
+            k = _popcount(comp_mask)
             if k == 0:
                 continue
-            if k <= self.enum_limit:
-                comp_probs = self._exact_probabilities(comp_constraints, comp_vars)
-                # gom kết quả
-                probs.update(comp_probs)
-
-        # 5) Nếu có ô chắc chắn (P=0 hoặc P=1) -> trả luôn
-        safes = [v for v, p in probs.items() if p <= 1e-12]
-        mines = [v for v, p in probs.items() if p >= 1.0 - 1e-12]
+            if st is not None:
+                st.add_component(k)
+            if self.enum_limit is None or k <= self.enum_limit:
+                res = self._count_component(comp_constraints, comp_mask)
+                if res is not None:
+                    counted.append(res)
+                    continue
+                if st is not None:
+                    st.skipped_state += 1
+            elif st is not None:
+                st.skipped_enum += 1
+            too_big.append((comp_constraints, comp_mask))
+        if st is not None:
+            t = st.add_time("count", t)
+
+        # 4b) Component quá lớn: ước lượng số nghiệm bằng lấy mẫu trong ngân sách thời gian
+        if too_big and self.mc_samples:
+            sampled, too_big = self._sample_components(too_big)
+            counted.extend(sampled)
+            if st is not None:
+                t = st.add_time("sample", t)
+
+        # 5) Ghép các component + ô nội vùng theo số mìn còn lại -> P(mine) thật cho mọi ô ẩn
+        probs, interior_p = self._exact_probabilities(board, counted, too_big)
+        if st is not None:
+            st.add_time("probabilities", t)
+
+        # 6) Nếu có ô chắc chắn (P=0 hoặc P=1) -> trả luôn
+        estimated = self.intervals
+        if estimated or too_big:
+            # trọng số toàn cục dựa trên số liệu ước lượng -> P=0/1 có thể sai; chỉ tin những ô chắc
+            # chắn với mọi T của chính component chính xác chứa nó
+            safes, mines = self._certain_any_total(counted)
+        else:
+            safes = [v for v, p in probs.items() if p <= 1e-12]
+            mines = [v for v, p in probs.items() if p >= 1.0 - 1e-12]
+        if interior_p is not None and not estimated and not too_big and \
+                (interior_p <= 1e-12 or interior_p >= 1.0 - 1e-12):
+            interior = self._interior_cells(board)
+            if interior_p <= 1e-12:
+                safes.extend(interior)
+            else:
+                mines.extend(interior)
         if safes or mines:
+            if st is not None:
+                st.probed += 1
             return {"flags": sorted(mines), "reveal": sorted(safes)}
+        if st is not None:
+            st.guessed += 1
 
-        # 6) Nếu chưa có nước đi chắc chắn, chọn ô có P nhỏ nhất để đoán
+        # 7) Nếu chưa có nước đi chắc chắn, chọn ô có P nhỏ nhất để đoán
+        #    (ô chỉ có P ước lượng: xếp theo cận trên của khoảng tin cậy cho thận trọng)
         if probs:
             best_v, best_p = None, 9e9
             for v, p in probs.items():
+                ci = estimated.get(v)
+                if ci is not None:
+                    p = ci[1]
                 if p < best_p:
                     best_v, best_p = v, p
+            if interior_p is not None and interior_p < best_p:
+                interior = self._interior_cells(board)
+                if interior:
+                    best_v = self._interior_guess(board, interior)
             self._best_guess = best_v
             return {"flags": [], "reveal": []}
 
-        # 7) Không tính được P (không có ràng buộc): đoán ô biên “giàu thông tin”
+        # 8) Không tính được P (không có ràng buộc): đoán ô biên “giàu thông tin”
         self._best_guess = self._border_guess(board)
         return {"flags": [], "reveal": []}
 
@@ -91,242 +223,346 @@ class MinesweeperAI:
             return self._best_guess
         return self._border_guess(board)
 
+    def forget(self):
+        # Bỏ frontier đã cache (vd. bàn bị sửa trong lúc đang suy luận); lần sau dựng lại từ board.changes
+        self._board = None
+        self._best_guess = None
+
     # ----------------- BUILD CONSTRAINTS -----------------
     def _build_constraints(self, board):
+        self._sync_frontier(board)
+        # Đánh chỉ số frontier cho bước này: ô -> bit
+        index = {}
+        cells = []
         constraints = []
-        seen = set()
-        for r in range(board.rows):
-            for c in range(board.cols):
-                cell = board.grid[r][c]
-                if not cell.revealed:
-                    continue
-                n = cell.adj
-                if n < 0:
-                    continue
-                neigh = list(board.neighbors(r, c))
-                flagged = [(rr, cc) for (rr, cc) in neigh if board.is_flagged(rr, cc)]
-                hidden = [(rr, cc) for (rr, cc) in neigh if (not board.is_revealed(rr, cc) and not board.is_flagged(rr, cc))]
-                rem = n - len(flagged)
-                if rem < 0:
-                    rem = 0
-                if hidden:
-                    key = (frozenset(hidden), rem)
-                    if key not in seen:
-                        seen.add(key)
-                        constraints.append({"vars": set(hidden), "sum": rem})
+        for vars_, rem in dict.fromkeys(self._cons.values()):
+            mask = 0
+            for v in vars_:
+                b = index.get(v)
+                if b is None:
+                    b = index[v] = len(cells)
+                    cells.append(v)
+                mask |= 1 << b
+            constraints.append((mask, rem))
+        self._cells = cells
         return constraints
 
+    def _to_cells(self, mask):
+        return sorted(self._cells[b] for b in _bits(mask))
+
+    def _sync_frontier(self, board):
+        # Bàn mới hoặc đã reset -> đọc lại nhật ký từ đầu (nhật ký phủ toàn bộ ván hiện tại)
+        if board is not self._board or board.epoch != self._epoch:
+            self._board = board
+            self._epoch = board.epoch
+            self._log_pos = 0
+            self._cons = {}
+        log = board.changes
+        if self._log_pos == len(log):
+            return
+        # Ô thay đổi ảnh hưởng tới ràng buộc của chính nó và của 8 ô kề
+        touched = set()
+        for (r, c) in log[self._log_pos:]:
+            touched.add((r, c))
+            touched.update(board.neighbors(r, c))
+        self._log_pos = len(log)
+        for src in touched:
+            self._update_constraint(board, src)
+
+    def _update_constraint(self, board, src):
+        r, c = src
+        if not board.is_revealed(r, c):
+            self._cons.pop(src, None)
+            return
+        n = board.adj_mines(r, c)
+        flagged = 0
+        hidden = []
+        for (rr, cc) in board.neighbors(r, c):
+            if board.is_flagged(rr, cc):
+                flagged += 1
+            elif not board.is_revealed(rr, cc):
+                hidden.append((rr, cc))
+        if hidden:
+            self._cons[src] = (frozenset(hidden), max(0, n - flagged))
+        else:
+            self._cons.pop(src, None)
+
     # ----------------- INFERENCE CORE -----------------
     def _trivial(self, constraints):
-        safes, mines = set(), set()
-        for c in constraints:
-            V, s = c["vars"], c["sum"]
-            if not V:
+        safes, mines = 0, 0
+        for m, s in constraints:
+            if not m:
                 continue
             if s == 0:
-                safes |= set(V)
-            elif s == len(V):
-                mines |= set(V)
+                safes |= m
+            elif s == _popcount(m):
+                mines |= m
         return safes, mines
 
     def _apply_known(self, constraints, safes, mines):
-        i = 0
-        while i < len(constraints):
-            c = constraints[i]
-            if not c["vars"]:
-                i += 1
+        known = safes | mines
+        out = []
+        for m, s in constraints:
+            if m & known:
+                # xóa biến đã biết; mỗi biến là mìn làm sum giảm 1
+                s -= _popcount(m & mines)
+                m &= ~known
+            if not m:
+                # rỗng: sum == 0 thì vô dụng, sum != 0 thì mâu thuẫn -> bỏ
                 continue
-            # xóa biến đã biết và điều chỉnh tổng
-            dec = 0
-            new_vars = set()
-            for v in c["vars"]:
-                if v in safes:
-                    # mine=0 -> chỉ bỏ biến
-                    continue
-                elif v in mines:
-                    # mine=1 -> sum giảm 1
-                    dec += 1
-                    continue
-                else:
-                    new_vars.add(v)
-            c["vars"] = new_vars
-            c["sum"] -= dec
-            # nếu rỗng mà sum != 0 thì mâu thuẫn -> bỏ
-            if not c["vars"] and c["sum"] != 0:
-                constraints.pop(i)
-            else:
-                i += 1
+            out.append((m, s))
         # khử trùng lặp
-        self._dedup(constraints)
-
-    def _subset_infer(self, constraints, known_safe, known_mine):
-        changed = False
+        return self._dedup(out)
+
+    def _var_index(self, constraints):
+        # bit -> danh sách chỉ số ràng buộc chứa biến đó
+        var2idx = defaultdict(list)
+        for idx, (m, _) in enumerate(constraints):
+            for b in _bits(m):
+                var2idx[b].append(idx)
+        return var2idx
+
+    def _subset_infer(self, constraints):
+        """Trả về các ràng buộc mới (diff, 0) / (diff, |diff|) suy ra từ cặp A ⊂ B."""
+        derived = []
         if len(constraints) < 2:
-            return False
-        # sắp theo kích thước để dễ xét A ⊂ B
-        constraints.sort(key=lambda c: len(c["vars"]))
-        n = len(constraints)
-        for i in range(n):
-            A = constraints[i]
-            VA, sA = A["vars"], A["sum"]
-            if not VA:
-                continue
-            for j in range(i + 1, n):
-                B = constraints[j]
-                VB, sB = B["vars"], B["sum"]
-                if not VB or VA == VB:
+            return derived
+        var2idx = self._var_index(constraints)
+        for i, (mA, sA) in enumerate(constraints):
+            # B ⊃ A phải chứa mọi biến của A -> chỉ xét các ràng buộc chứa biến hiếm nhất của A
+            cand = min((var2idx[b] for b in _bits(mA)), key=len)
+            for j in cand:
+                if j == i:
+                    continue
+                mB, sB = constraints[j]
+                if mB == mA or mA & mB != mA:
                     continue
-                if VA.issubset(VB):
-                    diff = VB - VA
-                    if not diff:
-                        continue
-                    k = sB - sA
-                    if k == 0:
-                        # diff all safe
-                        known_safe |= diff
-                        # thêm ràng buộc mới rõ ràng để trivial bắt được
-                        constraints.append({"vars": set(diff), "sum": 0})
-                        changed = True
-                    elif k == len(diff):
-                        # diff all mines
-                        known_mine |= diff
-                        constraints.append({"vars": set(diff), "sum": len(diff)})
-                        changed = True
-        if changed:
-            self._dedup(constraints)
-        return changed
+                diff = mB & ~mA
+                k = sB - sA
+                if k == 0:
+                    # diff all safe
+                    derived.append((diff, 0))
+                elif k == _popcount(diff):
+                    # diff all mines
+                    derived.append((diff, k))
+        return derived
 
     def _dedup(self, constraints):
-        seen = {}
-        out = []
-        for c in constraints:
-            key = (frozenset(c["vars"]), c["sum"])
-            if key not in seen:
-                seen[key] = c
-        out.extend(seen.values())
-        constraints[:] = out
+        return list(dict.fromkeys(constraints))
 
     # ----------------- COMPONENT SPLIT -----------------
     def _components(self, constraints):
-        # map biến -> constraint indices
-        var2idx = defaultdict(set)
-        for idx, c in enumerate(constraints):
-            for v in c["vars"]:
-                var2idx[v].add(idx)
+        var2idx = self._var_index(constraints)
 
-        visited_var = set()
+        visited = [False] * len(constraints)
         comps = []
-        for v in list(var2idx.keys()):
-            if v in visited_var:
+        for start in range(len(constraints)):
+            if visited[start]:
                 continue
-            q = deque([v])
-            comp_vars = set([v])
-            comp_cidx = set()
-            visited_var.add(v)
-            while q:
-                x = q.popleft()
-                for ci in var2idx[x]:
-                    if ci not in comp_cidx:
-                        comp_cidx.add(ci)
-                        for y in constraints[ci]["vars"]:
-                            if y not in visited_var:
-                                visited_var.add(y)
-                                comp_vars.add(y)
-                                q.append(y)
-            comp_constraints = [constraints[i] for i in comp_cidx]
-            comps.append((comp_constraints, comp_vars))
+            visited[start] = True
+            stack = [start]
+            comp_mask = 0
+            comp_constraints = []
+            while stack:
+                ci = stack.pop()
+                m = constraints[ci][0]
+                comp_constraints.append(constraints[ci])
+                for b in _bits(m & ~comp_mask):
+                    for cj in var2idx[b]:
+                        if not visited[cj]:
+                            visited[cj] = True
+                            stack.append(cj)
+                comp_mask |= m
+            comps.append((comp_constraints, comp_mask))
         return comps
 
-    # ----------------- EXACT ENUMERATION (BACKTRACK) -----------------
-    def _exact_probabilities(self, comp_constraints, comp_vars):
+    def _local(self, comp_constraints, comp_mask):
+        # Ràng buộc theo chỉ số biến trong component: (list[bit], list[(list[idx], sum)])
+        vars_list = list(_bits(comp_mask))
+        index_of = {v: i for i, v in enumerate(vars_list)}
+        return vars_list, [([index_of[b] for b in _bits(m)], s) for m, s in comp_constraints]
+
+    # ----------------- LINEAR INFERENCE -----------------
+    def _linear_infer(self, comps):
+        """Trả về (mask an toàn, mask mìn) tìm được bằng ai.linalg trên mọi component."""
+        safes, mines = 0, 0
+        for comp_constraints, comp_mask in comps:
+            # 1 ràng buộc (sau bão hòa) thì không suy thêm được gì
+            if len(comp_constraints) < 2 or _popcount(comp_mask) > self.linalg_limit:
+                continue
+            vars_list, C = self._local(comp_constraints, comp_mask)
+            for i, x in linear_forced(len(vars_list), C).items():
+                if x:
+                    mines |= 1 << vars_list[i]
+                else:
+                    safes |= 1 << vars_list[i]
+        return safes, mines
+
+    # ----------------- SAMPLING -----------------
+    def _sample_components(self, comps):
         """
-        Trả về dict[var -> P(var là mìn)] cho 1 component nhỏ.
+        Trả về (list[(list[bit], SampledCounts)] các component ước lượng được,
+        list các component còn lại - cỡ mẫu hiệu dụng dưới mc_min_ess).
         """
-        vars_list = list(comp_vars)
-        index_of = {v: i for i, v in enumerate(vars_list)}
+        st = self.stats
+        end = None
+        if self.mc_budget_ms is not None:
+            end = clock() + self.mc_budget_ms / 1000.0
+        out = []
+        failed = []
+        for i, (comp_constraints, comp_mask) in enumerate(comps):
+            # chia đều phần ngân sách còn lại cho các component chưa lấy mẫu
+            deadline = None
+            if end is not None:
+                now = clock()
+                deadline = now + max(0.0, end - now) / (len(comps) - i)
+            vars_list, C = self._local(comp_constraints, comp_mask)
+            sc = sample_component(len(vars_list), C, self.rng, self.mc_samples, deadline)
+            if st is not None:
+                st.sampled += 1
+                st.samples += sc.drawn
+            if sc.samples and sc.ess() >= self.mc_min_ess:
+                out.append((vars_list, sc))
+            else:
+                failed.append((comp_constraints, comp_mask))
+        return out, failed
 
-        # Ràng buộc theo chỉ số biến
-        C = []
-        for c in comp_constraints:
-            idxs = [index_of[v] for v in c["vars"]]
-            C.append({"idxs": idxs, "sum": c["sum"]})
-
-        # Trạng thái ràng buộc
-        assigned_sum = [0] * len(C)
-        remaining_cnt = [len(c["idxs"]) for c in C]
-        appear_in = [[] for _ in range(len(vars_list))]
-        for ci, c in enumerate(C):
-            for vi in c["idxs"]:
-                appear_in[vi].append(ci)
-
-        # Sắp biến theo độ “ràng buộc” giảm dần
-        order = list(range(len(vars_list)))
-        order.sort(key=lambda vi: -len(appear_in[vi]))
-
-        def feasible(ci):
-            s = assigned_sum[ci]
-            r = remaining_cnt[ci]
-            t = C[ci]["sum"]
-            return (s <= t) and (s + r >= t)
-
-        # DFS đếm số nghiệm (và số nghiệm có vi=1)
-        mine_solutions = [0] * len(vars_list)
-
-        def dfs_count(pos):
-            if pos == len(order):
-                # kiểm tra chặt
-                for ci in range(len(C)):
-                    if assigned_sum[ci] != C[ci]["sum"]:
-                        return 0
-                return 1
-
-            vi = order[pos]
-            total_here = 0
-
-            # val = 0
-            touched = []
-            ok = True
-            for ci in appear_in[vi]:
-                remaining_cnt[ci] -= 1
-                touched.append(ci)
-                if not feasible(ci):
-                    ok = False
-                    break
-            if ok:
-                total_here += dfs_count(pos + 1)
-            for ci in touched:
-                remaining_cnt[ci] += 1
-
-            # val = 1
-            touched = []
-            ok = True
-            for ci in appear_in[vi]:
-                remaining_cnt[ci] -= 1
-                assigned_sum[ci] += 1
-                touched.append(ci)
-                if not feasible(ci):
-                    ok = False
-                    break
-            if ok:
-                sols_1 = dfs_count(pos + 1)
-                total_here += sols_1
-                mine_solutions[vi] += sols_1
-            for ci in touched:
-                assigned_sum[ci] -= 1
-                remaining_cnt[ci] += 1
-
-            return total_here
-
-        total = dfs_count(0)
+    # ----------------- EXACT COUNTING (DP) -----------------
+    def _count_component(self, comp_constraints, comp_mask):
+        """
+        Trả về (list[bit], CountTable) cho 1 component, hoặc None nếu DP vượt state_limit.
+        Có cache thì tra theo dạng chuẩn trước; bảng trả về luôn theo thứ tự vars_list
+        (cùng kết quả dù trúng hay trượt cache).
+        """
+        vars_list, C = self._local(comp_constraints, comp_mask)
+        st = self.stats
+        cache = self.cache
+        if cache is not None:
+            key, order = canonical_key([self._cells[b] for b in vars_list], C)
+            table = cache.get(key)
+            if st is not None:
+                st.cache_lookups += 1
+            if table is not None:
+                if st is not None:
+                    st.cache_hits += 1
+                # order[i] = biến cục bộ ở vị trí chuẩn i -> đảo lại
+                rank = [0] * len(order)
+                for pos, i in enumerate(order):
+                    rank[i] = pos
+                return (vars_list, table.permuted(rank))
+        counts = solve_component(len(vars_list), C, self.state_limit)
+        if counts is None:
+            return None
+        if st is not None:
+            st.dp_states += counts.states
+        table = CountTable.from_counts(counts)
+        if cache is not None:
+            cache.put(key, table.permuted(order))
+        return (vars_list, table)
+
+    def _exact_probabilities(self, board, counted, skipped=()):
+        """
+        Mô hình toàn cục: component c có T mìn được trọng số theo số cách đặt phần mìn còn lại
+        (M - T) vào các component khác và I ô nội vùng: w_c(T) = sum_R rest_c[R] * C(I, M-T-R).
+        counted: list[(list[bit], CountTable | SampledCounts)] - bảng ước lượng ghép như bảng chính xác.
+        skipped: các component (constraints, mask) không đếm/ước lượng được. Ô của chúng không phải
+        ô nội vùng và không có P; số mìn của chúng lấy xấp xỉ bằng 1 giá trị cố định
+        (_expected_mines), nên khi có skipped thì mọi P trả về chỉ là xấp xỉ.
+        Trả về (dict[ô -> P(mìn)], P(mìn) của 1 ô nội vùng hoặc None).
+        """
         probs = {}
-        if total <= 0:
-            # hiếm khi rơi vào mâu thuẫn do trạng thái “bất khả” (cứ trả 0.5 trung lập)
-            for v in vars_list:
-                probs[v] = 0.5
-        else:
-            for pos, v in enumerate(vars_list):
-                probs[v] = float(mine_solutions[pos]) / float(total)
-        return probs
+        if not counted:
+            return probs, None
+        unknown = board.rows * board.cols - board.opened - board.flags
+        interior = unknown - sum(len(vars_list) for vars_list, _ in counted)
+        interior -= sum(_popcount(mask) for _, mask in skipped)
+        M = max(0, board.mines - board.flags - sum(self._expected_mines(c) for c, _ in skipped))
+        lf = log_factorials(board.rows * board.cols)
+
+        def log_c(k):
+            # log C(interior, k); None nếu không hợp lệ
+            if k < 0 or k > interior:
+                return None
+            return lf[interior] - lf[k] - lf[interior - k]
+
+        polys = [cc.by_mines for _, cc in counted]
+        # prefix[i] = tích chập polys[:i], suffix[i] = tích chập polys[i:]
+        prefix = [{0: 1}]
+        for poly in polys:
+            prefix.append(convolve(prefix[-1], poly))
+        suffix = [{0: 1}]
+        for poly in reversed(polys):
+            suffix.append(convolve(suffix[-1], poly))
+        suffix.reverse()
+
+        log_w = {}
+        for S, n in prefix[-1].items():
+            lc = log_c(M - S)
+            if lc is not None and n > 0:
+                log_w[S] = math.log(n) + lc
+        if not log_w:
+            # cờ sai / mâu thuẫn với tổng số mìn -> bỏ qua ràng buộc toàn cục
+            for vars_list, cc in counted:
+                self._component_probs(probs, vars_list, cc, None)
+            return probs, None
+        ref = max(log_w.values())
+
+        for i, (vars_list, cc) in enumerate(counted):
+            rest = convolve(prefix[i], suffix[i + 1])
+            weights = {}
+            for T in cc.by_mines:
+                w = 0.0
+                for R, n in rest.items():
+                    lc = log_c(M - T - R)
+                    if lc is not None and n > 0:
+                        w += math.exp(math.log(n) + lc - ref)
+                weights[T] = w
+            self._component_probs(probs, vars_list, cc, weights)
+
+        interior_p = None
+        if interior > 0:
+            z = sum(math.exp(lw - ref) for lw in log_w.values())
+            mines = sum(math.exp(lw - ref) * (M - S) for S, lw in log_w.items())
+            interior_p = mines / (z * interior)
+        return probs, interior_p
+
+    def _certain_any_total(self, counted):
+        # ô của component đếm chính xác là an toàn/mìn trong mọi nghiệm (không cần trọng số theo T)
+        safes, mines = [], []
+        for vars_list, cc in counted:
+            if isinstance(cc, SampledCounts):
+                continue
+            total, mine_solutions = cc.marginals()
+            if total <= 0:
+                continue
+            for b, n in zip(vars_list, mine_solutions):
+                if n == 0:
+                    safes.append(self._cells[b])
+                elif n == total:
+                    mines.append(self._cells[b])
+        return safes, mines
+
+    def _expected_mines(self, comp_constraints):
+        # ước lượng thô số mìn của 1 component: mỗi biến lấy trung bình mật độ s/|m| của
+        # các ràng buộc chứa nó
+        dens = defaultdict(list)
+        for m, s in comp_constraints:
+            d = s / _popcount(m)
+            for b in _bits(m):
+                dens[b].append(d)
+        return round(sum(sum(ds) / len(ds) for ds in dens.values()))
+
+    def _component_probs(self, probs, vars_list, cc, weights):
+        total, mine_solutions = cc.marginals(weights)
+        if isinstance(cc, SampledCounts):
+            for b, ci in zip(vars_list, cc.intervals(weights)):
+                self.intervals[self._cells[b]] = ci
+        for pos, b in enumerate(vars_list):
+            if total <= 0:
+                # hiếm khi rơi vào mâu thuẫn do trạng thái “bất khả” (cứ trả 0.5 trung lập)
+                probs[self._cells[b]] = 0.5
+            else:
+                probs[self._cells[b]] = float(mine_solutions[pos]) / float(total)
 
     # ----------------- GUESSES -----------------
     def _border_guess(self, board):
@@ -349,4 +585,15 @@ class MinesweeperAI:
         border.sort(key=lambda x: -x[0])
         best_near = border[0][0]
         best = [cell for near, cell in border if near == best_near]
-        return random.choice(best)
+        return self.rng.choice(best)
+
+    def _interior_cells(self, board):
+        # ô ẩn không nằm trong ràng buộc nào (không kề ô số đã mở)
+        frontier = set(self._cells)
+        return [v for v in board.unknown_cells() if v not in frontier]
+
+    def _interior_guess(self, board, interior):
+        # mọi ô nội vùng cùng xác suất -> ưu tiên góc/cạnh (ít láng giềng, dễ ra ô 0)
+        fewest = min(len(board.neighbors(r, c)) for (r, c) in interior)
+        best = [(r, c) for (r, c) in interior if len(board.neighbors(r, c)) == fewest]
+        return self.rng.choice(best)
@@ -0,0 +1,66 @@
+# minesweeper/ai/autoplay.py
+# Một nhịp AI tự chơi, dùng chung cho vòng lặp pygame (main.py) và bộ chạy headless (sim/).
+# plan_step chỉ đọc bàn (chạy được trên thread nền), apply_step mới sửa bàn.
+import time
+
+
+def _is_open(board, r, c):
+    return board.is_revealed(r, c) or board.is_flagged(r, c)
+
+
+def plan_step(board, ai):
+    """
+    Tính 1 nhịp AI mà không sửa bàn. Trả về (actions, guess): guess chỉ có khi
+    actions không làm thay đổi gì (giống play_step: đoán khi không còn nước chắc chắn).
+    """
+    actions = ai.next_actions(board)
+    if any(not _is_open(board, r, c) for (r, c) in actions["flags"]) or \
+       any(not _is_open(board, r, c) for (r, c) in actions["reveal"]):
+        return (actions, None)
+    return (actions, ai.guess(board))
+
+
+def apply_step(board, actions, guess=None):
+    """Áp dụng kết quả của plan_step lên bàn. Trả về (hit_mine, any_change, guessed)."""
+    any_change = False
+
+    # Apply flags first
+    for (r, c) in actions["flags"]:
+        if not board.is_revealed(r, c) and not board.is_flagged(r, c):
+            board.toggle_flag(r, c)
+            any_change = True
+
+    # Apply reveals
+    for (r, c) in actions["reveal"]:
+        hit_mine, changed = board.reveal(r, c)
+        any_change = any_change or changed
+        if hit_mine:
+            return (True, True, False)
+
+    # If no deterministic actions, AI guesses 1 cell
+    if not any_change and guess:
+        hit_mine, changed = board.reveal(*guess)
+        return (hit_mine, changed, True)
+    return (False, any_change, False)
+
+
+def play_step(board, ai):
+    """
+    Chạy 1 nhịp AI: cắm cờ trước, rồi mở các ô an toàn; nếu không có thay đổi thì đoán 1 ô.
+    Trả về (hit_mine, any_change, guessed).
+    """
+    return apply_step(board, *plan_step(board, ai))
+
+
+def play_turbo(board, ai, budget_ms):
+    """
+    Chạy liên tiếp nhiều nhịp AI trong budget_ms (1 frame): dừng khi trúng mìn, thắng, hết nước,
+    vừa đoán 1 ô (để người xem thấy từng lần đoán) hoặc hết giờ. Trả về (hit_mine, steps, guessed).
+    """
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    steps = 0
+    while True:
+        hit_mine, changed, guessed = play_step(board, ai)
+        steps += 1
+        if hit_mine or guessed or not changed or board.check_win() or time.perf_counter() >= deadline:
+            return (hit_mine, steps, guessed)
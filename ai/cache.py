@@ -0,0 +1,127 @@
+# minesweeper/ai/cache.py
+# Cache bảng đếm nghiệm (CountTable) theo dạng chuẩn của component: các mẫu biên nhỏ
+# (tường 1-2-1, cặp 1-1 ở góc...) lặp lại liên tục trong 1 ván và giữa các ván.
+import json
+import threading
+from collections import OrderedDict
+
+from .counting import CountTable
+
+# 8 phép đối xứng của lưới (quay 90° và lật); số nghiệm chỉ phụ thuộc siêu đồ thị
+# (biến, ràng buộc, tổng) nên mọi phép đều hợp lệ - không có gì phụ thuộc hướng.
+_TRANSFORMS = (
+    lambda r, c: (r, c), lambda r, c: (r, -c), lambda r, c: (-r, c), lambda r, c: (-r, -c),
+    lambda r, c: (c, r), lambda r, c: (c, -r), lambda r, c: (-c, r), lambda r, c: (-c, -r),
+)
+
+
+def canonical_key(cells, constraints):
+    """
+    cells: list[(r, c)] của các biến; constraints: list[(list[chỉ số biến], sum)].
+    Trả về (key, order): key (chuỗi) như nhau cho mọi ảnh của component qua tịnh tiến,
+    quay và lật; order[i] = chỉ số biến (trong cells) đứng ở vị trí chuẩn thứ i.
+    Biến được đánh số theo thứ tự đọc sau từng phép đối xứng; lấy cách đánh số cho
+    danh sách ràng buộc nhỏ nhất.
+    """
+    n = len(cells)
+    best = best_order = None
+    for f in _TRANSFORMS:
+        pts = [f(r, c) for r, c in cells]
+        # thứ tự đọc (hàng rồi cột) sau phép biến đổi -> không phụ thuộc tịnh tiến
+        order = sorted(range(n), key=pts.__getitem__)
+        rank = [0] * n
+        for pos, i in enumerate(order):
+            rank[i] = pos
+        cand = tuple(sorted((tuple(sorted(rank[v] for v in vs)), s) for vs, s in constraints))
+        if best is None or cand < best:
+            best, best_order = cand, order
+    # khóa chỉ gồm cấu trúc ràng buộc theo thứ tự chuẩn: hai component khác hình nhưng cùng
+    # cấu trúc sau khi đánh số vẫn có cùng bảng đếm
+    key = f"{n}|" + ";".join(".".join(map(str, vs)) + f"={s}" for vs, s in best)
+    return key, best_order
+
+
+class ComponentCache:
+    """
+    LRU: dạng chuẩn -> CountTable (biến theo thứ tự chuẩn), tối đa maxsize mục.
+    hits/misses đếm số lần get() trúng/trượt. save()/load() lưu JSON để các lô sim chạy
+    sau bắt đầu với cache "ấm"; take_new() trả về các mục thêm từ lần gọi trước (gửi từ
+    tiến trình con về tiến trình cha). Có khóa: AIWorker cũ (vừa close) có thể còn chạy
+    song song với AI của ván mới.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._new = {}  # khóa thêm từ lần take_new() trước (bị loại khỏi LRU thì bỏ luôn)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            table = self._data.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(self, key, table):
+        with self._lock:
+            self._data[key] = table
+            self._data.move_to_end(key)
+            self._new[key] = None
+            while len(self._data) > self.maxsize:
+                old, _ = self._data.popitem(last=False)
+                self._new.pop(old, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._new = {}
+            self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self):
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    # ----------------- EXPORT / PERSIST -----------------
+    def entries(self, keys=None):
+        """Danh sách [key, by_mines, per_var] dạng JSON (dict khóa số -> list cặp), cũ -> mới."""
+        with self._lock:
+            tables = [(key, self._data.get(key)) for key in (self._data if keys is None else keys)]
+        return [[key, sorted(table.by_mines.items()), [sorted(pv.items()) for pv in table.per_var]]
+                for key, table in tables if table is not None]
+
+    def update(self, entries):
+        for key, by_mines, per_var in entries:
+            if key not in self._data:
+                self.put(key, CountTable({t: n for t, n in by_mines},
+                                         [{t: n for t, n in pv} for pv in per_var]))
+
+    def take_new(self):
+        with self._lock:
+            keys, self._new = self._new, {}
+        return self.entries(keys)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"maxsize": self.maxsize, "entries": self.entries()}, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path, maxsize=None):
+        with open(path) as f:
+            data = json.load(f)
+        cache = cls(maxsize or data.get("maxsize", 4096))
+        cache.update(data["entries"])
+        cache._new = {}
+        return cache
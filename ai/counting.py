@@ -0,0 +1,280 @@
+# minesweeper/ai/counting.py
+"""
+Đếm nghiệm chính xác cho 1 component bằng DP theo thứ tự biến (không liệt kê từng nghiệm).
+
+Biến được xếp theo BFS trên đồ thị "chung ràng buộc" để tập ràng buộc đang mở (đã gán
+ít nhất 1 biến nhưng chưa gán hết) luôn nhỏ. Trạng thái tại biên p = tuple tổng riêng phần
+của các ràng buộc đang mở; số trạng thái phụ thuộc độ rộng của frontier chứ không phải 2^n.
+  - forward:  f[p][s] = số cách gán biến 0..p-1 dẫn tới trạng thái s
+  - backward: b[p][s] = số cách gán biến p..n-1 từ trạng thái s thỏa mọi ràng buộc
+Số nghiệm có biến p là mìn = sum_s f[p][s] * b[p+1][T(s, 1)].
+
+Trạng thái mang thêm số mìn đã đặt (phần tử cuối của tuple), nên forward cho luôn số nghiệm
+theo từng tổng số mìn T của component; backward có thể nhận trọng số w(T) (mô hình toàn cục
+ghép các component với ô nội vùng bằng hệ số tổ hợp).
+"""
+import math
+from array import array
+from collections import deque
+
+
+def _bfs_order(n, var_cons, cons_vars):
+    # Bắt đầu từ biến ít láng giềng nhất (thường ở đầu 1 "bức tường") rồi BFS
+    order = []
+    seen = [False] * n
+    degree = [sum(len(cons_vars[ci]) for ci in var_cons[v]) for v in range(n)]
+    for start in sorted(range(n), key=lambda v: degree[v]):
+        if seen[start]:
+            continue
+        seen[start] = True
+        q = deque([start])
+        while q:
+            v = q.popleft()
+            order.append(v)
+            for ci in var_cons[v]:
+                for w in cons_vars[ci]:
+                    if not seen[w]:
+                        seen[w] = True
+                        q.append(w)
+    return order
+
+
+class ComponentCounts:
+    """Kết quả forward DP của 1 component: by_mines[T] = số nghiệm có đúng T mìn."""
+
+    def __init__(self, n, order, layers, trans, final):
+        self.n = n
+        self._order = order
+        self._layers = layers
+        self._trans = trans
+        self.by_mines = {s[-1]: cnt for s, cnt in final.items()}
+
+    @property
+    def states(self):
+        # số trạng thái DP đã duyệt (tổng qua các tầng)
+        return sum(len(layer) for layer in self._layers)
+
+    def marginals(self, weights=None):
+        """
+        Trả về (Z, mine_counts): Z = sum_T w(T)*by_mines[T], mine_counts[v] = tổng có trọng số
+        của các nghiệm có v là mìn. weights=None -> w(T)=1 (đếm nghiệm thuần túy).
+        """
+        n = self.n
+        if not self.by_mines:
+            return (0, [0] * n)  # component mâu thuẫn
+        if weights is None:
+            back = {(t,): 1 for t in self.by_mines}
+        else:
+            back = {(t,): weights.get(t, 0) for t in self.by_mines}
+        mine_counts = [0] * n
+        for p in range(n - 1, -1, -1):
+            fwd = self._layers[p]
+            nb = {}
+            mines = 0
+            for s, (n0, n1) in self._trans[p].items():
+                c0 = back.get(n0, 0) if n0 is not None else 0
+                c1 = back.get(n1, 0) if n1 is not None else 0
+                if c0 or c1:
+                    nb[s] = c0 + c1
+                    mines += fwd[s] * c1
+            mine_counts[self._order[p]] = mines
+            back = nb
+        return (back.get((0,), 0), mine_counts)
+
+    def sample(self, rng):
+        """
+        Rút 1 nghiệm đều trong mọi nghiệm: list 0/1 theo chỉ số biến, hoặc None nếu component
+        mâu thuẫn. Đi ngược 1 lượt lấy số cách hoàn tất từ mỗi trạng thái, rồi đi xuôi chọn
+        x = 0/1 với xác suất tỉ lệ số cách hoàn tất của trạng thái kế tiếp.
+        """
+        if not self.by_mines:
+            return None
+        backs = [None] * (self.n + 1)
+        backs[self.n] = {(t,): 1 for t in self.by_mines}
+        for p in range(self.n - 1, -1, -1):
+            back = backs[p + 1]
+            nb = {}
+            for s, (n0, n1) in self._trans[p].items():
+                c = (back.get(n0, 0) if n0 is not None else 0) + (back.get(n1, 0) if n1 is not None else 0)
+                if c:
+                    nb[s] = c
+            backs[p] = nb
+        out = [0] * self.n
+        s = (0,)
+        for p in range(self.n):
+            n0, n1 = self._trans[p][s]
+            c0 = backs[p + 1].get(n0, 0) if n0 is not None else 0
+            c1 = backs[p + 1].get(n1, 0) if n1 is not None else 0
+            # c0 + c1 có thể rất lớn (số nguyên Python) -> so sánh nguyên, không qua float
+            if rng.randrange(c0 + c1) < c1:
+                out[self._order[p]] = 1
+                s = n1
+            else:
+                s = n0
+        return out
+
+    def by_variable(self):
+        """
+        per_var[v] = {T: số nghiệm có đúng T mìn và v là mìn}. Một lượt đi ngược như marginals
+        nhưng thông điệp là dict {T: số cách} thay cho 1 trọng số (T nằm ở phần tử cuối trạng thái).
+        """
+        per_var = [{} for _ in range(self.n)]
+        back = {(t,): {t: 1} for t in self.by_mines}
+        for p in range(self.n - 1, -1, -1):
+            fwd = self._layers[p]
+            nb = {}
+            mines = per_var[self._order[p]]
+            for s, (n0, n1) in self._trans[p].items():
+                b0 = back.get(n0) if n0 is not None else None
+                b1 = back.get(n1) if n1 is not None else None
+                if b1:
+                    f = fwd[s]
+                    for t, cnt in b1.items():
+                        mines[t] = mines.get(t, 0) + f * cnt
+                if b0 and b1:
+                    merged = dict(b0)
+                    for t, cnt in b1.items():
+                        merged[t] = merged.get(t, 0) + cnt
+                    nb[s] = merged
+                elif b0 or b1:
+                    nb[s] = b0 or b1
+            back = nb
+        return per_var
+
+
+class CountTable:
+    """
+    Bảng đếm của 1 component không phụ thuộc thứ tự DP: by_mines[T] = số nghiệm có T mìn,
+    per_var[v][T] = số nghiệm có T mìn và v là mìn. marginals() cùng giao diện với ComponentCounts
+    nhưng chỉ tốn O(n * số giá trị T); bảng gọn, đổi thứ tự biến được nên dùng làm giá trị cache.
+    """
+
+    def __init__(self, by_mines, per_var):
+        self.by_mines = by_mines
+        self.per_var = per_var
+
+    @classmethod
+    def from_counts(cls, cc):
+        return cls(cc.by_mines, cc.by_variable() if cc.by_mines else [{} for _ in range(cc.n)])
+
+    @property
+    def n(self):
+        return len(self.per_var)
+
+    def permuted(self, order):
+        # biến thứ i của bảng mới = biến order[i] của bảng này
+        return CountTable(self.by_mines, [self.per_var[i] for i in order])
+
+    def marginals(self, weights=None):
+        if not self.by_mines:
+            return (0, [0] * self.n)
+        if weights is None:
+            return (sum(self.by_mines.values()), [sum(pv.values()) for pv in self.per_var])
+        total = sum(weights.get(t, 0) * cnt for t, cnt in self.by_mines.items())
+        return (total, [sum(weights.get(t, 0) * cnt for t, cnt in pv.items()) for pv in self.per_var])
+
+
+def solve_component(n, constraints, state_limit=None, by_mines=True):
+    """
+    constraints: list[(list[var_idx], sum)] trên các biến 0..n-1.
+    Chạy forward DP, trả về ComponentCounts, hoặc None nếu 1 tầng vượt quá state_limit trạng thái.
+    by_mines=False: không tách nghiệm theo số mìn (ít trạng thái hơn; by_mines chỉ còn khóa 0).
+    """
+    cons_vars = [list(vs) for vs, _ in constraints]
+    target = [t for _, t in constraints]
+    var_cons = [[] for _ in range(n)]
+    for ci, vs in enumerate(cons_vars):
+        for v in vs:
+            var_cons[v].append(ci)
+
+    order = _bfs_order(n, var_cons, cons_vars)
+    pos = [0] * n
+    for p, v in enumerate(order):
+        pos[v] = p
+    first = [min(pos[v] for v in vs) if vs else -1 for vs in cons_vars]
+    last = [max(pos[v] for v in vs) if vs else -1 for vs in cons_vars]
+    for ci, vs in enumerate(cons_vars):
+        if not vs and target[ci] != 0:
+            return ComponentCounts(n, order, [], [], {})
+
+    # Kế hoạch chuyển tầng cho từng vị trí p
+    left = [len(vs) for vs in cons_vars]  # số biến chưa gán của mỗi ràng buộc
+    active = []                           # ràng buộc đang mở tại biên hiện tại (thứ tự cố định)
+    plans = []
+    for p in range(n):
+        slot = {ci: k for k, ci in enumerate(active)}
+        checks = []
+        for ci in var_cons[order[p]]:
+            left[ci] -= 1
+            checks.append((slot.get(ci, -1), target[ci], left[ci]))
+        mine_here = set(var_cons[order[p]])
+        nxt_active = [ci for ci in active if last[ci] > p]
+        nxt_active += [ci for ci in var_cons[order[p]] if first[ci] == p and last[ci] > p]
+        outs = [(slot.get(ci, -1), ci in mine_here) for ci in nxt_active]
+        plans.append((checks, outs))
+        active = nxt_active
+
+    # forward, lưu lại chuyển trạng thái để đi ngược; s[-1] = số mìn đã đặt (0 nếu không by_mines)
+    layer = {(0,): 1}
+    layers = []
+    trans = []
+    for checks, outs in plans:
+        nxt = {}
+        tr = {}
+        for s, cnt in layer.items():
+            pair = [None, None]
+            for x in (0, 1):
+                ok = True
+                for src, t, rem in checks:
+                    v = (s[src] if src >= 0 else 0) + x
+                    if v > t or v + rem < t:
+                        ok = False
+                        break
+                if not ok:
+                    continue
+                ns = tuple((s[src] if src >= 0 else 0) + (x if inc else 0) for src, inc in outs)
+                ns += (s[-1] + x if by_mines else 0,)
+                nxt[ns] = nxt.get(ns, 0) + cnt
+                pair[x] = ns
+            tr[s] = pair
+        layers.append(layer)
+        trans.append(tr)
+        if state_limit is not None and len(nxt) > state_limit:
+            return None
+        layer = nxt
+    return ComponentCounts(n, order, layers, trans, layer)
+
+
+def count_solutions(n, constraints, state_limit=None):
+    """
+    Trả về (total, mine_counts) với mine_counts[v] = số nghiệm có v là mìn,
+    hoặc None nếu DP vượt quá state_limit.
+    """
+    cc = solve_component(n, constraints, state_limit)
+    if cc is None:
+        return None
+    return cc.marginals()
+
+
+def convolve(a, b):
+    """Tích chập 2 đa thức dạng dict {số mìn: số nghiệm}."""
+    out = {}
+    for i, x in a.items():
+        for j, y in b.items():
+            out[i + j] = out.get(i + j, 0) + x * y
+    return out
+
+
+_LOG_FACT = {}
+
+def log_factorials(n):
+    """Bảng log(k!) cho k = 0..n, tính 1 lần cho mỗi kích thước bàn (n = rows*cols)."""
+    table = _LOG_FACT.get(n)
+    if table is None:
+        table = array("d", bytes(8 * (n + 1)))
+        acc = 0.0
+        for k in range(1, n + 1):
+            acc += math.log(k)
+            table[k] = acc
+        _LOG_FACT[n] = table
+    return table
@@ -0,0 +1,149 @@
+# minesweeper/ai/linalg.py
+"""
+Suy luận tuyến tính trên 1 component: đưa hệ ràng buộc 0/1 (A x = b) về dạng bậc thang rút gọn
+rồi xét cận của từng hàng. Với hàng sum_j a_j x_j = b và x_j ∈ {0, 1}:
+  - b == tổng hệ số âm  -> mọi biến hệ số dương = 0, hệ số âm = 1
+  - b == tổng hệ số dương -> mọi biến hệ số dương = 1, hệ số âm = 0
+Bắt được các suy luận cần kết hợp nhiều hơn 2 ràng buộc (subset chỉ xét từng cặp A ⊂ B),
+nên nhiều bước không cần tới DP đếm nghiệm.
+
+Component nhỏ: khử Gauss chính xác trên số nguyên Python (mỗi hàng chia cho gcd).
+Component từ NUMPY_MIN biến: numpy float64 có chọn pivot; kết quả được kiểm tra lại với
+ràng buộc gốc, sai thì bỏ và chạy bản số nguyên.
+"""
+import math
+from functools import reduce
+
+try:
+    import numpy as np
+except ImportError:  # numpy là tùy chọn; không có thì luôn dùng bản số nguyên
+    np = None
+
+NUMPY_MIN = 24
+_EPS = 1e-9
+_TOL = 1e-7
+
+
+def _rref_int(rows, n):
+    # rows: list[list[int]] dài n+1 (cột cuối = vế phải); khử tại chỗ, trả về các hàng khác 0
+    rank = 0
+    for col in range(n):
+        piv = next((i for i in range(rank, len(rows)) if rows[i][col]), None)
+        if piv is None:
+            continue
+        rows[rank], rows[piv] = rows[piv], rows[rank]
+        pr = rows[rank]
+        p = pr[col]
+        for i in range(len(rows)):
+            a = rows[i][col]
+            if i == rank or not a:
+                continue
+            row = [x * p - y * a for x, y in zip(rows[i], pr)]
+            g = reduce(math.gcd, row)
+            rows[i] = [x // g for x in row] if g > 1 else row
+        rank += 1
+        if rank == len(rows):
+            break
+    return rows[:rank]
+
+
+def _bounds(row, n, forced):
+    # xét cận của 1 hàng (hệ số bất kỳ); ghi biến bị ép vào forced {biến: 0|1}
+    b = row[n]
+    lo = sum(a for a in row[:n] if a < 0)
+    hi = sum(a for a in row[:n] if a > 0)
+    if b == lo:
+        for j in range(n):
+            if row[j]:
+                forced[j] = 0 if row[j] > 0 else 1
+    elif b == hi:
+        for j in range(n):
+            if row[j]:
+                forced[j] = 1 if row[j] > 0 else 0
+
+
+def _forced_int(n, constraints):
+    rows = []
+    for vs, s in constraints:
+        row = [0] * (n + 1)
+        for v in vs:
+            row[v] = 1
+        row[n] = s
+        rows.append(row)
+    forced = {}
+    for row in _rref_int(rows, n):
+        if any(row[:n]):
+            _bounds(row, n, forced)
+    return forced
+
+
+def _forced_numpy(n, constraints):
+    m = len(constraints)
+    A = np.zeros((m, n + 1))
+    for i, (vs, s) in enumerate(constraints):
+        A[i, vs] = 1.0
+        A[i, n] = s
+    rank = 0
+    for col in range(n):
+        if rank == m:
+            break
+        piv = rank + int(np.argmax(np.abs(A[rank:, col])))
+        if abs(A[piv, col]) < _EPS:
+            continue
+        A[[rank, piv]] = A[[piv, rank]]
+        A[rank] /= A[rank, col]
+        f = A[:, col].copy()
+        f[rank] = 0.0
+        A -= np.outer(f, A[rank])
+        A[np.abs(A) < _EPS] = 0.0
+        rank += 1
+    A = A[:rank]
+    coef, b = A[:, :n], A[:, n]
+    lo = np.where(coef < 0, coef, 0.0).sum(axis=1)
+    hi = np.where(coef > 0, coef, 0.0).sum(axis=1)
+    forced = {}
+    for i in np.flatnonzero(np.abs(b - lo) < _TOL):
+        for j in np.flatnonzero(coef[i]):
+            forced[int(j)] = 0 if coef[i, j] > 0 else 1
+    for i in np.flatnonzero((np.abs(b - hi) < _TOL) & (np.abs(b - lo) >= _TOL)):
+        for j in np.flatnonzero(coef[i]):
+            forced[int(j)] = 1 if coef[i, j] > 0 else 0
+    return forced
+
+
+def _consistent(constraints, forced):
+    # kết quả float phải không mâu thuẫn với ràng buộc gốc
+    for vs, s in constraints:
+        mines = sum(1 for v in vs if forced.get(v) == 1)
+        free = sum(1 for v in vs if v not in forced)
+        if mines > s or mines + free < s:
+            return False
+    return True
+
+
+def linear_forced(n, constraints, numpy_min=NUMPY_MIN):
+    """
+    constraints: list[(list[chỉ số biến], sum)] trên các biến 0..n-1.
+    Trả về dict {biến: 0 (an toàn) | 1 (mìn)} các biến bị ép, lặp tới khi không tìm thêm
+    (thay biến đã biết vào hệ rồi khử lại).
+    """
+    known = {}
+    cons = constraints
+    while cons:
+        if np is not None and n - len(known) >= numpy_min:
+            found = _forced_numpy(n, cons)
+            if not _consistent(cons, found):
+                found = _forced_int(n, cons)
+        else:
+            found = _forced_int(n, cons)
+        found = {v: x for v, x in found.items() if v not in known}
+        if not found:
+            break
+        known.update(found)
+        nxt = []
+        for vs, s in cons:
+            rest = [v for v in vs if v not in known]
+            if rest:
+                nxt.append((rest, s - sum(known[v] for v in vs if v in known)))
+        cons = nxt
+    return known
@@ -0,0 +1,329 @@
+# minesweeper/ai/sampling.py
+"""
+Ước lượng P(mìn) cho component mà DP đếm chính xác vượt state_limit, bằng MCMC trên tập nghiệm.
+
+Nghiệm xuất phát tìm bằng quay lui có lan truyền ràng buộc (forward checking): gán 1 biến thì
+ràng buộc đã đủ mìn ép mọi biến còn lại của nó = 0, ràng buộc chỉ còn vừa đủ chỗ ép chúng = 1,
+và lan tiếp; mâu thuẫn thì quay lui. Lấy mẫu tuần tự (gán từng biến, đi tới ngõ cụt là bỏ) hầu
+như không ra nghiệm trên component vài trăm biến, nên chỉ dùng quay lui để có điểm xuất phát.
+
+Xích Markov (Gibbs theo khối): trạng thái là 1 nghiệm đầy đủ; mỗi bước lấy khối ~block biến
+quanh 1 biến (BFS trên đồ thị chung ràng buộc), giữ nguyên các biến ngoài khối và rút lại cả
+khối đều trong mọi cách gán hợp lệ (DP của counting.py trên hệ con - khối nhỏ nên rẻ). Mỗi bước
+giữ nguyên phân phối đều trên các nghiệm, nên tần suất T mìn ~ by_mines[T] và tần suất biến v là
+mìn ~ P(v): ghép vào mô hình toàn cục như bảng đếm chính xác (chỉ tỉ lệ giữa các T là có nghĩa).
+
+Chạy vài xích từ các nghiệm xuất phát khác nhau; mẫu liền nhau tương quan nên thời gian tự tương
+quan của từng biến tính bằng batch means gộp mọi xích, cộng độ lệch giữa các xích: xích trộn
+chậm hoặc các xích không thống nhất (kẹt ở các vùng khác nhau) -> ESS nhỏ -> ai.py bỏ ước lượng;
+riêng 1 vài biến trộn chậm -> khoảng tin cậy của chúng rộng.
+"""
+import math
+import time
+from collections import deque
+
+from .counting import _bfs_order, solve_component
+
+
+class SampledCounts:
+    """
+    Kết quả lấy mẫu của 1 component, cùng giao diện với CountTable (by_mines, marginals)
+    để dùng chung _exact_probabilities; thêm ess() và intervals() cho khoảng tin cậy của P(mìn).
+    chains: list các xích, mỗi xích list[(T, mask)] (bit v của mask = biến v là mìn), đã bỏ burn-in.
+    """
+
+    def __init__(self, n, chains, drawn):
+        self.n = n
+        self.chains = chains
+        self.samples = [s for chain in chains for s in chain]
+        self.drawn = drawn  # số mẫu đã rút, kể cả burn-in
+        self.by_mines = {}
+        for t, _ in self.samples:
+            self.by_mines[t] = self.by_mines.get(t, 0) + 1
+        self.tau, self._mixing = self._autocorrelation()
+
+    def _autocorrelation(self):
+        # thời gian tự tương quan của từng biến theo batch means: tau_v = b * var(trung bình lô) / p(1-p),
+        # lô dài b = sqrt(độ dài xích) trong từng xích. Batch means không thấy tau lớn hơn b: xích kẹt
+        # ở 1 mode suốt cả lượt chạy trông như mẫu độc lập -> lấy thêm cùng công thức với "lô" là cả
+        # xích (các xích không thống nhất -> tau ~ độ dài xích). Biến không đổi trong mọi mẫu lấy tau lớn nhất
+        def lots(size):
+            out = []
+            for chain in self.chains:
+                b = size(len(chain))
+                for k in range(len(chain) // b):
+                    counts = [0] * self.n
+                    for _, mask in chain[k * b:(k + 1) * b]:
+                        while mask:
+                            low = mask & -mask
+                            counts[low.bit_length() - 1] += 1
+                            mask ^= low
+                    out.append((b, counts))
+            return out
+
+        def estimate(batches, v):
+            total = sum(b for b, _ in batches)
+            p = sum(counts[v] for _, counts in batches) / total
+            if not 0.0 < p < 1.0:
+                return None
+            var = sum(b * (counts[v] / b - p) ** 2 for b, counts in batches) / (len(batches) - 1)
+            return max(1.0, var / (p * (1 - p)))
+
+        batches = lots(lambda length: max(1, math.isqrt(length)))
+        if len(batches) < 2:
+            return [float(max(1, len(self.samples)))] * self.n, []
+        whole = lots(lambda length: max(1, length))
+        tau = [None] * self.n
+        for v in range(self.n):
+            t = estimate(batches, v)
+            if t is not None and len(whole) >= 2:
+                t = max(t, estimate(whole, v))
+            tau[v] = t
+        mixing = sorted(t for t in tau if t is not None)  # tau của các biến có đổi giá trị
+        top = mixing[-1] if mixing else 1.0
+        return [top if t is None else t for t in tau], mixing
+
+    def _weights(self, weights):
+        if weights is None:
+            return [1.0] * len(self.samples)
+        return [weights.get(t, 0) for t, _ in self.samples]
+
+    def marginals(self, weights=None):
+        ws = self._weights(weights)
+        mine_counts = [0.0] * self.n
+        for w, (_, mask) in zip(ws, self.samples):
+            if not w:
+                continue
+            while mask:
+                low = mask & -mask
+                mine_counts[low.bit_length() - 1] += w
+                mask ^= low
+        return (sum(ws), mine_counts)
+
+    def ess(self, weights=None):
+        """
+        Cỡ mẫu hiệu dụng: (sum w)^2 / sum w^2 chia cho thời gian tự tương quan trung vị của các biến
+        có đổi giá trị (biến không đổi trong mọi mẫu, thường là biến bị ép, không tính). Không lấy
+        tau lớn nhất: ước lượng tau của từng biến nhiễu, max trên vài trăm biến luôn lớn; biến trộn
+        chậm hơn đã có khoảng tin cậy rộng tương ứng trong intervals().
+        """
+        ws = self._weights(weights)
+        sq = sum(w * w for w in ws)
+        if self._mixing:
+            tau = self._mixing[len(self._mixing) // 2]
+        else:
+            tau = self.tau[0] if self.tau else 1.0
+        return sum(ws) ** 2 / sq / tau if sq > 0 else 0.0
+
+    def intervals(self, weights=None, z=1.96):
+        """
+        Khoảng tin cậy cho P(mìn) của từng biến, theo cùng trọng số toàn cục w(T) như marginals().
+        Nửa độ rộng = max(z * sai số chuẩn (phương pháp delta, nhân tau của biến), nửa độ rộng
+        Wilson với cỡ mẫu = ESS của biến). Phần Wilson giữ cho khoảng không co về 1 điểm khi mọi
+        mẫu cùng giá trị. Không có mẫu -> (0, 1).
+        Khoảng riêng cho từng ô, không đồng thời: mọi ô dùng chung 1 bộ mẫu nên khi ước lượng lệch
+        thì nhiều ô cùng trượt một lúc.
+        """
+        ws = self._weights(weights)
+        total = sum(ws)
+        sq = sum(w * w for w in ws)
+        if total <= 0 or sq <= 0:
+            return [(0.0, 1.0)] * self.n
+        mines = [0.0] * self.n
+        mines_sq = [0.0] * self.n  # sum w^2 * x_v
+        for w, (_, mask) in zip(ws, self.samples):
+            if not w:
+                continue
+            w2 = w * w
+            while mask:
+                low = mask & -mask
+                v = low.bit_length() - 1
+                mines[v] += w
+                mines_sq[v] += w2
+                mask ^= low
+        z2 = z * z
+        out = []
+        for m, m2, tau in zip(mines, mines_sq, self.tau):
+            n = total * total / sq / tau
+            p = m / total
+            # var(p) ~ tau * sum w^2 (x - p)^2 / (sum w)^2
+            var = tau * max(0.0, m2 * (1 - 2 * p) + p * p * sq) / (total * total)
+            wilson = z * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) / (1 + z2 / n)
+            center = (p + z2 / (2 * n)) / (1 + z2 / n)
+            half = max(z * math.sqrt(var), wilson)
+            mid = center if half == wilson else p
+            lo, hi = max(0.0, mid - half), min(1.0, mid + half)
+            # mọi mẫu cùng giá trị: Wilson chạm đúng 0 / 1 về lý thuyết, giữ nguyên cận đó khỏi sai số làm tròn
+            out.append((0.0 if m <= 0 else lo, 1.0 if m >= total else hi))
+        return out
+
+
+class _Assignment:
+    """Gán 0/1 từng phần cho các biến, giữ số mìn đã đặt / số biến chưa gán của mỗi ràng buộc."""
+
+    def __init__(self, n, cons_vars, target, var_cons):
+        self.cons_vars = cons_vars
+        self.target = target
+        self.var_cons = var_cons
+        self.val = [-1] * n
+        self.placed = [0] * len(target)
+        self.left = [len(vs) for vs in cons_vars]
+        self.trail = []  # biến đã gán, theo thứ tự (để quay lui)
+
+    def assign(self, v, x):
+        """Gán v = x rồi lan truyền các giá trị bị ép; False nếu có ràng buộc bị phá."""
+        val, placed, left, target = self.val, self.placed, self.left, self.target
+        stack = [(v, x)]
+        while stack:
+            u, x = stack.pop()
+            if val[u] >= 0:
+                if val[u] != x:
+                    return False
+                continue
+            val[u] = x
+            self.trail.append(u)
+            for ci in self.var_cons[u]:
+                left[ci] -= 1
+                placed[ci] += x
+            for ci in self.var_cons[u]:
+                p, r, t = placed[ci], left[ci], target[ci]
+                if p > t or p + r < t:
+                    return False
+                if r and (p == t or p + r == t):
+                    y = 0 if p == t else 1
+                    stack.extend((w, y) for w in self.cons_vars[ci] if val[w] < 0)
+        return True
+
+    def undo(self, mark):
+        val, placed, left = self.val, self.placed, self.left
+        while len(self.trail) > mark:
+            u = self.trail.pop()
+            x, val[u] = val[u], -1
+            for ci in self.var_cons[u]:
+                left[ci] += 1
+                placed[ci] -= x
+
+
+def _first_solution(n, cons_vars, target, var_cons, order, rng, node_limit, restart):
+    """
+    1 nghiệm ngẫu nhiên (list 0/1) bằng quay lui + forward checking, None nếu tổng số nút vượt
+    node_limit. Thời gian quay lui có đuôi rất dài (đa số lần thử ra nghiệm ngay, số ít kẹt lâu
+    ở 1 nhánh sai gần gốc) nên cứ sau `restart` nút lại làm lại từ đầu với lựa chọn ngẫu nhiên mới.
+    """
+    nodes = 0
+    while nodes < node_limit:
+        a = _Assignment(n, cons_vars, target, var_cons)
+        val = a.val
+        stack = []  # (vị trí trong order, biến, giá trị chưa thử hoặc None, mốc trail)
+        i = 0
+        stop = min(node_limit, nodes + restart)
+        while nodes < stop:
+            while i < n and val[order[i]] >= 0:
+                i += 1
+            if i == n:
+                return val
+            nodes += 1
+            v = order[i]
+            x = 1 if rng.random() < 0.5 else 0
+            stack.append((i, v, 1 - x, len(a.trail)))
+            ok = a.assign(v, x)
+            while not ok:
+                if not stack:
+                    return None  # đã thử hết mọi nhánh: component mâu thuẫn
+                i, v, alt, mark = stack.pop()
+                a.undo(mark)
+                if alt is not None:
+                    stack.append((i, v, None, mark))
+                    ok = a.assign(v, alt)
+    return None
+
+
+def _block(start, size, var_cons, cons_vars):
+    # tối đa size biến gần start nhất theo BFS trên đồ thị chung ràng buộc
+    seen = {start}
+    q = deque([start])
+    out = []
+    while q and len(out) < size:
+        v = q.popleft()
+        out.append(v)
+        for ci in var_cons[v]:
+            for w in cons_vars[ci]:
+                if w not in seen:
+                    seen.add(w)
+                    q.append(w)
+    return out
+
+
+def _redraw(val, block, cons_vars, target, var_cons, rng, state_limit):
+    # rút lại các biến của block đều trong mọi cách gán khớp với phần còn lại của val
+    index = {v: i for i, v in enumerate(block)}
+    seen = set()
+    sub = []
+    for v in block:
+        for ci in var_cons[v]:
+            if ci in seen:
+                continue
+            seen.add(ci)
+            inside = [index[w] for w in cons_vars[ci] if w in index]
+            fixed = sum(val[w] for w in cons_vars[ci] if w not in index)
+            sub.append((inside, target[ci] - fixed))
+    counts = solve_component(len(block), sub, state_limit, by_mines=False)
+    xs = counts.sample(rng) if counts is not None else None
+    if xs is None:
+        return False
+    for v, x in zip(block, xs):
+        val[v] = x
+    return True
+
+
+def sample_component(n, constraints, rng, max_samples=200, deadline=None, chains=4, block=32,
+                     state_limit=2000, node_limit=100000, restart=1000):
+    """
+    constraints: list[(list[chỉ số biến], sum)] trên các biến 0..n-1.
+    Chạy `chains` xích Gibbs theo khối `block` biến, ghi 1 mẫu sau mỗi lượt quét (rút lại các khối
+    quanh những biến chưa được rút trong lượt, theo thứ tự ngẫu nhiên, tới khi phủ hết n biến);
+    tối đa max_samples mẫu, dừng sớm khi time.perf_counter() vượt deadline (giây). Mỗi xích bỏ
+    10% mẫu đầu (burn-in). Không tìm được nghiệm xuất phát -> SampledCounts rỗng.
+    """
+    cons_vars = [list(vs) for vs, _ in constraints]
+    target = [t for _, t in constraints]
+    var_cons = [[] for _ in range(n)]
+    for ci, vs in enumerate(cons_vars):
+        for v in vs:
+            var_cons[v].append(ci)
+    order = _bfs_order(n, var_cons, cons_vars)
+    vals = []
+    for _ in range(chains):
+        val = _first_solution(n, cons_vars, target, var_cons, order, rng, node_limit, restart)
+        if val is None:
+            break
+        vals.append(val)
+    if not vals:
+        return SampledCounts(n, [], 0)
+
+    block = min(block, n)
+    runs = [[] for _ in vals]
+    drawn = 0
+    done = False
+    while not done:
+        for val, run in zip(vals, runs):
+            if drawn >= max_samples or (drawn and deadline is not None and time.perf_counter() > deadline):
+                done = True
+                break
+            starts = list(range(n))
+            rng.shuffle(starts)
+            covered = [False] * n
+            for v in starts:
+                if covered[v]:
+                    continue
+                ball = _block(v, block, var_cons, cons_vars)
+                for w in ball:
+                    covered[w] = True
+                _redraw(val, ball, cons_vars, target, var_cons, rng, state_limit)
+            mask = 0
+            for v in range(n):
+                if val[v]:
+                    mask |= 1 << v
+            run.append((sum(val), mask))
+            drawn += 1
+    return SampledCounts(n, [run[len(run) // 10:] for run in runs], drawn)
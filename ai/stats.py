@@ -0,0 +1,135 @@
+# minesweeper/ai/stats.py
+# Thống kê tùy chọn cho MinesweeperAI.next_actions: thời gian từng pha, số vòng bão hòa,
+# kích thước component... Tắt (stats=None) thì AI chỉ tốn vài phép so sánh với None.
+import json
+import time
+from dataclasses import dataclass, field
+
+# Các pha của next_actions, theo thứ tự chạy
+PHASES = ("build", "saturate", "components", "linalg", "count", "sample", "probabilities")
+
+clock = time.perf_counter
+
+
+@dataclass
+class AIStats:
+    """
+    Cộng dồn qua mọi lần gọi next_actions của các AI dùng chung 1 AIStats:
+      - seconds[phase]      tổng thời gian thực của từng pha (PHASES)
+      - rounds / derived    số vòng lặp trivial+subset, số ràng buộc subset sinh ra
+      - constraints         tổng số ràng buộc dựng được (max_constraints: lớn nhất 1 bước)
+      - comp_sizes[k]       số component có k biến (histogram)
+      - dp_states           số trạng thái DP đã duyệt khi đếm nghiệm
+      - cache_lookups/hits  số lần tra / trúng ai.cache.ComponentCache (khi AI có cache)
+      - skipped_enum/state  số component bỏ qua vì > enum_limit / vượt state_limit
+      - sampled / samples   số component ước lượng bằng lấy mẫu (ai.sampling), tổng số mẫu đã rút
+      - solved/linear/probed/guessed  số bước kết thúc bằng suy luận / khử Gauss / P=0|1 / đoán
+    to_dict()/from_dict() cho JSON; merge() để gộp kết quả từ nhiều tiến trình.
+    """
+    steps: int = 0
+    seconds: dict = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    rounds: int = 0
+    max_rounds: int = 0
+    derived: int = 0
+    constraints: int = 0
+    max_constraints: int = 0
+    comp_sizes: dict = field(default_factory=dict)
+    dp_states: int = 0
+    cache_lookups: int = 0
+    cache_hits: int = 0
+    skipped_enum: int = 0
+    skipped_state: int = 0
+    sampled: int = 0
+    samples: int = 0
+    solved: int = 0
+    linear: int = 0
+    probed: int = 0
+    guessed: int = 0
+
+    def add_time(self, phase, t0):
+        """Cộng thời gian từ t0 tới giờ vào phase; trả về thời điểm hiện tại (mốc cho pha sau)."""
+        now = clock()
+        self.seconds[phase] += now - t0
+        return now
+
+    def add_component(self, k):
+        self.comp_sizes[k] = self.comp_sizes.get(k, 0) + 1
+
+    @property
+    def total_seconds(self):
+        return sum(self.seconds.values())
+
+    def merge(self, other):
+        self.steps += other.steps
+        for phase, secs in other.seconds.items():
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + secs
+        self.rounds += other.rounds
+        self.max_rounds = max(self.max_rounds, other.max_rounds)
+        self.derived += other.derived
+        self.constraints += other.constraints
+        self.max_constraints = max(self.max_constraints, other.max_constraints)
+        for k, n in other.comp_sizes.items():
+            self.comp_sizes[k] = self.comp_sizes.get(k, 0) + n
+        self.dp_states += other.dp_states
+        self.cache_lookups += other.cache_lookups
+        self.cache_hits += other.cache_hits
+        self.skipped_enum += other.skipped_enum
+        self.skipped_state += other.skipped_state
+        self.sampled += other.sampled
+        self.samples += other.samples
+        self.solved += other.solved
+        self.linear += other.linear
+        self.probed += other.probed
+        self.guessed += other.guessed
+        return self
+
+    def to_dict(self):
+        d = dict(self.__dict__)
+        d["seconds"] = dict(self.seconds)
+        # khóa JSON phải là chuỗi; sắp theo kích thước cho dễ đọc
+        d["comp_sizes"] = {str(k): self.comp_sizes[k] for k in sorted(self.comp_sizes)}
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        d = dict(d)
+        d["seconds"] = dict(d.get("seconds", {}))
+        d["comp_sizes"] = {int(k): n for k, n in d.get("comp_sizes", {}).items()}
+        return cls(**d)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def report(self):
+        """Bảng tóm tắt nhiều dòng (ms/bước theo pha, histogram component gom theo lũy thừa 2)."""
+        steps = self.steps or 1
+        total = self.total_seconds or 1.0
+        lines = [f"{self.steps} steps: {self.solved} solved by inference, {self.linear} by elimination, "
+                 f"{self.probed} by P=0/1, {self.guessed} guesses"]
+        for phase in PHASES:
+            secs = self.seconds.get(phase, 0.0)
+            lines.append(f"  {phase:14} {1000 * secs / steps:9.3f} ms/step {100 * secs / total:6.1f} %")
+        lines.append(f"  saturation rounds {self.rounds / steps:.2f}/step (max {self.max_rounds}), "
+                     f"{self.derived} derived constraints")
+        lines.append(f"  constraints {self.constraints / steps:.1f}/step (max {self.max_constraints}), "
+                     f"DP states {self.dp_states}, skipped components: {self.skipped_enum} > enum_limit, "
+                     f"{self.skipped_state} > state_limit")
+        if self.sampled:
+            lines.append(f"  sampled components {self.sampled}, {self.samples / self.sampled:.0f} samples each")
+        if self.cache_lookups:
+            lines.append(f"  component cache {self.cache_hits}/{self.cache_lookups} hits "
+                         f"({100 * self.cache_hits / self.cache_lookups:.1f} %)")
+        buckets = {}
+        for k, n in self.comp_sizes.items():
+            lo = 1 << (k.bit_length() - 1)
+            buckets[lo] = buckets.get(lo, 0) + n
+        if buckets:
+            lines.append("  component sizes " + "  ".join(
+                f"{lo}-{2 * lo - 1}:{buckets[lo]}" for lo in sorted(buckets)))
+        return "\n".join(lines)
@@ -0,0 +1,68 @@
+# minesweeper/ai/worker.py
+# Chạy suy luận AI trên thread nền để vòng lặp vẽ 60 FPS không bị đứng khi gặp component lớn.
+import queue
+import threading
+
+from .autoplay import plan_step
+
+
+class AIWorker:
+    """
+    Thread nền tính plan_step(board, ai); kết quả trả về qua queue.
+      - request(board): gửi 1 yêu cầu (mỗi lúc chỉ 1 yêu cầu đang chờ)
+      - poll(): (actions, guess) nếu yêu cầu hiện tại đã xong, ngược lại None
+      - cancel(): bỏ yêu cầu đang chờ (reset/restart); kết quả cũ bị loại theo token
+    Trong lúc pending, luồng chính không được sửa bàn (thread nền đang đọc).
+    """
+
+    def __init__(self, ai):
+        self.ai = ai
+        self.pending = False
+        self._token = 0
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+        self._thread.start()
+
+    def request(self, board):
+        self._token += 1
+        self.pending = True
+        self._requests.put((self._token, board, board.epoch))
+
+    def cancel(self):
+        self._token += 1
+        self.pending = False
+
+    def poll(self):
+        while True:
+            try:
+                token, plan, error = self._results.get_nowait()
+            except queue.Empty:
+                return None
+            if token != self._token or not self.pending:
+                continue  # kết quả của yêu cầu đã bị hủy
+            self.pending = False
+            if error is not None:
+                raise error
+            return plan
+
+    def close(self):
+        self.cancel()
+        self._requests.put(None)
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            token, board, epoch = item
+            if token != self._token:
+                continue  # bị hủy trước khi bắt đầu
+            try:
+                plan, error = plan_step(board, self.ai), None
+            except Exception as e:
+                plan, error = None, e
+            if token != self._token or board.epoch != epoch:
+                # bàn có thể đã bị reset giữa chừng -> frontier trong AI không còn đáng tin
+                self.ai.forget()
+            self._results.put((token, plan, error))
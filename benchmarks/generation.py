@@ -0,0 +1,61 @@
+"""
+Benchmark first-click generation (mine placement + adjacency) and report cells/sec.
+
+    python -m benchmarks.generation --size 1000x1000 --density 0.16 --backend grid,array
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from core.board import make_board
+
+
+def bench_generation(rows, cols, mines, backend="grid", repeat=3, seed=0):
+    """Time `_place_mines_safe` on fresh boards; returns the best run in seconds."""
+    random.seed(seed)
+    best = float("inf")
+    for _ in range(repeat):
+        board = make_board(rows, cols, mines, backend)
+        t0 = time.perf_counter()
+        board._place_mines_safe(rows // 2, cols // 2)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _parse_size(text):
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--size", action="append", type=_parse_size,
+                    help="ROWSxCOLS, can be repeated (default: 16x30, 200x200, 1000x1000)")
+    ap.add_argument("--density", type=float, default=0.2062, help="mine ratio (default: expert)")
+    ap.add_argument("--backend", default="grid,array", help="comma-separated: grid,array")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    sizes = args.size or [(16, 30), (200, 200), (1000, 1000)]
+    print(f"{'backend':8} {'size':>11} {'mines':>8} {'best ms':>10} {'Mcells/s':>10}")
+    for backend in args.backend.split(","):
+        for rows, cols in sizes:
+            mines = int(rows * cols * args.density)
+            try:
+                secs = bench_generation(rows, cols, mines, backend, args.repeat, args.seed)
+            except ImportError as exc:
+                print(f"{backend:8} skipped: {exc}")
+                break
+            rate = rows * cols / secs if secs > 0 else float("inf")
+            print(f"{backend:8} {f'{rows}x{cols}':>11} {mines:>8} {secs * 1000:>10.2f} {rate / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
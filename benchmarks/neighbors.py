@@ -0,0 +1,144 @@
+"""
+Microbenchmark: precomputed neighbour tables (core.neighbors) vs the old dr/dc generator,
+for flood fill and for building the AI's constraints from scratch.
+
+    python -m benchmarks.neighbors --size 200x200 --backend grid,array
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from core.board import make_board
+from ai.ai import MinesweeperAI
+from ai.autoplay import play_step
+
+
+def legacy_neighbors(board, r, c):
+    # Board.neighbors before the tables: tuple per candidate + inb() check
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr == 0 and dc == 0: continue
+            rr, cc = r + dr, c + dc
+            if board.inb(rr, cc): yield rr, cc
+
+
+def legacy_flood_grid(board, sr, sc):
+    q = deque([(sr, sc)])
+    while q:
+        r, c = q.popleft()
+        cell = board.grid[r][c]
+        if cell.revealed or cell.flagged: continue
+        cell.revealed = True
+        board.opened += 1
+        board.changes.append((r, c))
+        if cell.adj == 0:
+            for (rr, cc) in legacy_neighbors(board, r, c):
+                if not board.grid[rr][cc].revealed and not board.grid[rr][cc].flagged:
+                    q.append((rr, cc))
+
+
+def legacy_flood_array(board, sr, sc):
+    cols = board.cols
+    rev, flag, adj = board._rev_f, board._flag_f, board._adj_f
+    q = deque([(sr, sc)])
+    while q:
+        r, c = q.popleft()
+        i = r * cols + c
+        if rev[i] or flag[i]: continue
+        rev[i] = 1
+        board.opened += 1
+        board.changes.append((r, c))
+        if adj[i] == 0:
+            for (rr, cc) in legacy_neighbors(board, r, c):
+                j = rr * cols + cc
+                if not rev[j] and not flag[j]:
+                    q.append((rr, cc))
+
+
+def _best(fn, repeat, setup=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_flood(rows, cols, density, backend="grid", repeat=3, seed=0):
+    """Open one big zero region (low mine density); returns (legacy s, table s, cells opened)."""
+    board = make_board(rows, cols, int(rows * cols * density), backend, rng=seed)
+    r, c = rows // 2, cols // 2
+    board._place_mines_safe(r, c)
+    board.generated = True
+    snap = board.snapshot()
+    legacy = legacy_flood_array if backend == "array" else legacy_flood_grid
+
+    def setup():
+        board.restore(snap)
+
+    t_old = _best(lambda: legacy(board, r, c), repeat, setup)
+    t_new = _best(lambda: board._flood_open(r, c), repeat, setup)
+    return t_old, t_new, board.opened
+
+
+def bench_constraints(rows, cols, density, backend="grid", repeat=3, seed=0, steps=6):
+    """Build the AI frontier from scratch on a mid-game position; returns (legacy s, table s, constraints)."""
+    board = make_board(rows, cols, int(rows * cols * density), backend, rng=seed)
+    board.reveal(rows // 2, cols // 2)
+    ai = MinesweeperAI(rng=seed)
+    for _ in range(steps):
+        hit_mine, _, _ = play_step(board, ai)
+        if hit_mine or board.check_win():
+            break
+
+    def run():
+        return MinesweeperAI()._build_constraints(board)
+
+    t_new = _best(run, repeat)
+    board.neighbors = lambda r, c: legacy_neighbors(board, r, c)  # instance override, AI calls it
+    try:
+        t_old = _best(run, repeat)
+    finally:
+        del board.neighbors
+    return t_old, t_new, len(run())
+
+
+def _parse_size(text):
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--size", action="append", type=_parse_size,
+                    help="ROWSxCOLS, can be repeated (default: 16x30, 200x200)")
+    ap.add_argument("--backend", default="grid,array", help="comma-separated: grid,array")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    sizes = args.size or [(16, 30), (200, 200)]
+    print(f"{'case':12} {'backend':8} {'size':>9} {'legacy ms':>10} {'table ms':>9} {'speedup':>8} {'n':>8}")
+    for backend in args.backend.split(","):
+        for rows, cols in sizes:
+            try:
+                cases = [("flood", bench_flood(rows, cols, 0.05, backend, args.repeat, args.seed)),
+                         ("constraints", bench_constraints(rows, cols, 0.16, backend, args.repeat, args.seed))]
+            except ImportError as exc:
+                print(f"{'':12} {backend:8} skipped: {exc}")
+                break
+            for name, (t_old, t_new, n) in cases:
+                print(f"{name:12} {backend:8} {f'{rows}x{cols}':>9} {t_old * 1000:>10.2f} "
+                      f"{t_new * 1000:>9.2f} {t_old / t_new:>7.2f}x {n:>8}")
+
+
+if __name__ == "__main__":
+    main()
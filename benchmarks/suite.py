@@ -0,0 +1,261 @@
+"""
+Benchmark suite for the hot paths of Board, MinesweeperAI and the pygame renderer.
+
+    python -m benchmarks.suite --out bench.json                       # run everything
+    python -m benchmarks.suite --quick --only board/                   # skip huge boards, one group
+    python -m benchmarks.suite --out new.json --compare bench.json     # flag regressions (exit 1)
+    python -m benchmarks.suite --make-positions                        # regenerate positions.json
+
+Everything is seeded, so two runs time the same work. Board cases run on every config.LEVELS
+entry plus large boards and both backends; AI and rendering cases run on the mid-game
+positions stored in positions.json (Board.snapshot() bytes, hex-encoded).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from config import LEVELS
+from core.board import Board, make_board
+from ai.ai import MinesweeperAI
+from ai.autoplay import play_step
+
+POSITIONS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "positions.json")
+SEED = 1234
+EXPERT_DENSITY = 99 / 480
+
+# (rows, cols, density): boards beyond the game levels; the sparse one stresses flood fill
+LARGE = [(200, 200, EXPERT_DENSITY), (1000, 1000, EXPERT_DENSITY), (1000, 1000, 0.05)]
+QUICK_LARGE = [(200, 200, EXPERT_DENSITY), (200, 200, 0.05)]
+
+
+def timeit(fn, setup=None, repeat=5, number=1):
+    """Best and mean seconds per call of fn() over `repeat` runs of `number` calls."""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - t0) / number)
+    return {"best": min(runs), "mean": sum(runs) / len(runs), "repeat": repeat, "number": number}
+
+
+def _backends():
+    try:
+        import numpy  # noqa: F401
+        return ("grid", "array")
+    except ImportError:
+        return ("grid",)
+
+
+def _boards(quick):
+    for key, cfg in LEVELS.items():
+        yield f"L{key}", cfg["rows"], cfg["cols"], cfg["mines"]
+    for rows, cols, density in (QUICK_LARGE if quick else LARGE):
+        yield f"{rows}x{cols}@{density:.2f}", rows, cols, int(rows * cols * density)
+
+
+# ---------------- board ----------------
+def bench_board(backend, name, rows, cols, mines, repeat):
+    out = {}
+    center = (rows // 2, cols // 2)
+    board = make_board(rows, cols, mines, backend, rng=SEED)
+
+    def fresh():
+        board.reset(SEED)
+
+    out[f"board/place_mines/{backend}/{name}"] = timeit(lambda: board._place_mines_safe(*center), fresh, repeat)
+
+    fresh()
+    board._place_mines_safe(*center)
+    board.generated = True
+    placed = board.snapshot()
+    out[f"board/flood_open/{backend}/{name}"] = timeit(lambda: board._flood_open(*center),
+                                                       lambda: board.restore(placed), repeat)
+
+    out[f"board/check_win/{backend}/{name}"] = timeit(board.check_win, repeat=repeat, number=1000)
+
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+    def all_neighbors():
+        for r, c in cells:
+            for _ in board.neighbors(r, c):
+                pass
+    out[f"board/neighbors/{backend}/{name}"] = timeit(all_neighbors, repeat=repeat)
+    return out
+
+
+# ---------------- positions ----------------
+def make_positions(path=POSITIONS):
+    """Play seeded AI games and keep the position halfway through each unfinished game."""
+    specs = [(f"L{key}", cfg["rows"], cfg["cols"], cfg["mines"]) for key, cfg in LEVELS.items()]
+    specs += [("100x100", 100, 100, int(100 * 100 * EXPERT_DENSITY))]
+    positions = []
+    for name, rows, cols, mines in specs:
+        for seed in range(SEED, SEED + 3):
+            board = make_board(rows, cols, mines, rng=seed)
+            ai = MinesweeperAI(rng=seed)
+            board.reveal(rows // 2, cols // 2)
+            history = []
+            while not board.check_win():
+                history.append(board.snapshot())
+                hit_mine, changed, guessed = play_step(board, ai)
+                if hit_mine or (not changed and not guessed):
+                    break
+            snap = history[len(history) // 2]
+            positions.append({"name": f"{name}-s{seed}", "snapshot": snap.hex()})
+    with open(path, "w") as f:
+        json.dump(positions, f, indent=1)
+    return positions
+
+
+def load_positions(path=POSITIONS):
+    with open(path) as f:
+        return [(p["name"], bytes.fromhex(p["snapshot"])) for p in json.load(f)]
+
+
+# ---------------- AI ----------------
+def bench_ai(name, snap, repeat):
+    board = Board.from_snapshot(snap)
+    out = {f"ai/next_actions/{name}": timeit(lambda: MinesweeperAI(rng=SEED).next_actions(board), repeat=repeat)}
+
+    # capture the inputs of _exact_probabilities during one call, then time it alone
+    ai = MinesweeperAI(rng=SEED)
+    captured = []
+    exact = ai._exact_probabilities
+    ai._exact_probabilities = lambda b, *args: captured.append(args) or exact(b, *args)
+    ai.next_actions(board)
+    del ai._exact_probabilities
+    if captured:
+        out[f"ai/exact_probabilities/{name}"] = timeit(lambda: exact(board, *captured[0]), repeat=repeat)
+    return out
+
+
+# ---------------- rendering ----------------
+def bench_render(positions, repeat):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from core.timer import GameTimer
+    from core.game_state import GameState, GameMode
+    from config import FACE, HUD
+    from ui.display import draw_board, compute_window_size, init_fonts
+    from ui.hud import draw_hud
+    from ui.camera import Camera
+
+    pygame.init()
+    init_fonts()
+    out = {}
+    timer = GameTimer()
+    for name, snap in positions:
+        board = Board.from_snapshot(snap)
+        screen = pygame.display.set_mode(compute_window_size(board.rows, board.cols))
+        state = GameState(level_key=name, mode=GameMode.AI)
+        view = (0, HUD["height"], screen.get_width(), screen.get_height() - HUD["height"])
+        camera = Camera(board.rows, board.cols, view)
+        draw_board(screen, board, state, camera)  # warm the atlas/font caches
+        out[f"ui/draw_board/{name}"] = timeit(lambda: draw_board(screen, board, state, camera), repeat=repeat)
+        out[f"ui/draw_hud/{name}"] = timeit(lambda: draw_hud(screen, board, timer, state, FACE["neutral"]),
+                                            repeat=repeat, number=20)
+    pygame.quit()
+    return out
+
+
+# ---------------- run / compare ----------------
+def run(quick=False, repeat=5, only=None):
+    results = {}
+    def want(prefix): return only is None or prefix.startswith(only) or only.startswith(prefix)
+    if want("board/"):
+        for backend in _backends():
+            for name, rows, cols, mines in _boards(quick):
+                results.update(bench_board(backend, name, rows, cols, mines, repeat))
+    positions = load_positions()
+    if want("ai/"):
+        for name, snap in positions:
+            results.update(bench_ai(name, snap, repeat))
+    if want("ui/"):
+        results.update(bench_render(positions, repeat))
+    if only:
+        results = {k: v for k, v in results.items() if k.startswith(only)}
+    return {"meta": _meta(quick, repeat), "results": results}
+
+
+def _meta(quick, repeat):
+    meta = {"python": platform.python_version(), "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "quick": quick, "repeat": repeat}
+    try:
+        import numpy
+        meta["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    try:
+        import pygame
+        meta["pygame"] = pygame.version.ver
+    except ImportError:
+        pass
+    return meta
+
+
+def compare(base, new, threshold=0.10):
+    """Return [(name, base s, new s, ratio, flag)] for cases in both runs; flag = 'REGRESSION'/'faster'/''."""
+    rows = []
+    for name, res in sorted(new["results"].items()):
+        old = base["results"].get(name)
+        if old is None:
+            continue
+        ratio = res["best"] / old["best"] if old["best"] > 0 else float("inf")
+        flag = "REGRESSION" if ratio > 1 + threshold else ("faster" if ratio < 1 - threshold else "")
+        rows.append((name, old["best"], res["best"], ratio, flag))
+    return rows
+
+
+def print_results(report, out=sys.stdout):
+    out.write(f"{'case':58} {'best us':>12} {'mean us':>12}\n")
+    for name, res in sorted(report["results"].items()):
+        out.write(f"{name:58} {res['best'] * 1e6:>12.1f} {res['mean'] * 1e6:>12.1f}\n")
+
+
+def print_comparison(rows, out=sys.stdout):
+    out.write(f"{'case':58} {'base us':>12} {'new us':>12} {'ratio':>7}\n")
+    for name, old, new, ratio, flag in rows:
+        out.write(f"{name:58} {old * 1e6:>12.1f} {new * 1e6:>12.1f} {ratio:>7.2f} {flag}\n")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--out", metavar="PATH", help="write results as JSON")
+    ap.add_argument("--compare", metavar="BASELINE", help="compare with an earlier JSON run")
+    ap.add_argument("--threshold", type=float, default=0.10, help="relative slowdown flagged as regression")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--quick", action="store_true", help="skip the 1000x1000 boards")
+    ap.add_argument("--only", metavar="PREFIX", help="run only cases starting with PREFIX (board/, ai/, ui/...)")
+    ap.add_argument("--make-positions", action="store_true", help="regenerate the stored mid-game positions")
+    args = ap.parse_args(argv)
+
+    if args.make_positions:
+        positions = make_positions()
+        print(f"wrote {len(positions)} positions to {POSITIONS}")
+        return
+
+    report = run(args.quick, args.repeat, args.only)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(json.load(f), report, args.threshold)
+        print_comparison(rows)
+        if any(flag == "REGRESSION" for *_, flag in rows):
+            sys.exit(1)
+    else:
+        print_results(report)
+
+
+if __name__ == "__main__":
+    main()
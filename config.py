@@ -14,6 +14,18 @@ LEVELS = {
     "5": {"rows": 16, "cols": 30, "mines": 99},
 }
 
+# -------- BOARD STORAGE --------
+BOARD = {
+    "backend": "grid",  # "grid" (Cell objects) | "array" (NumPy planes, cho bàn rất lớn)
+    "debug": False,     # True: check_win đối chiếu bộ đếm với quét toàn bàn
+    "undo_depth": 64,   # số snapshot giữ lại cho phím U (undo, chế độ Player)
+}
+
+# -------- REPLAY LOG --------
+REPLAY = {
+    "path": "replays/games.msrp",  # mọi ván trong cửa sổ game được ghi vào đây (core/replay.py); None = tắt
+}
+
 # -------- COLORS --------
 COLORS = {
     "bg": (28, 28, 28),
@@ -52,6 +64,15 @@ HUD = {
     "font_px": 28,
 }
 
+# -------- VIEWPORT (bàn lớn hơn màn hình: cuộn + zoom) --------
+VIEW = {
+    "max_w": 1280,      # kích thước cửa sổ tối đa
+    "max_h": 860,
+    "zoom_levels": (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48),  # cỡ ô (px) khi zoom
+    "overview_px": 8,   # ô nhỏ hơn mức này -> vẽ overview từ dữ liệu bàn, không vẽ từng sprite
+    "pan_px": 24,       # bước cuộn mỗi frame khi giữ phím mũi tên
+}
+
 # -------- FACE ICONS (emoji/text) --------
 FACE = {
     "neutral": "🙂",
@@ -61,5 +82,13 @@ FACE = {
 
 # -------- AI CONFIG --------
 AI = {
-    "step_ms": 70  # tốc độ AI (ms mỗi nhịp)
+    "step_ms": 70,       # tốc độ AI (ms mỗi nhịp) khi policy = "paced"
+    "policy": "paced",   # "paced": mỗi nhịp cách nhau step_ms | "max": nhịp sau ngay khi nhịp trước xong
+                         # "turbo": mỗi frame chạy liên tục các nhịp trong turbo_budget_ms, chỉ vẽ trạng thái cuối
+    "turbo_budget_ms": 12,
+    "cache_size": 4096,  # số component (dạng chuẩn) giữ trong cache bảng đếm; 0 = tắt cache
+    # Component quá lớn để đếm chính xác (DP vượt state_limit) -> ước lượng P(mìn) bằng lấy mẫu (ai.sampling)
+    "mc_samples": 200,     # số mẫu tối đa mỗi component; 0 = tắt (đoán theo ô biên như trước)
+    "mc_budget_ms": 2000,  # ngân sách thời gian lấy mẫu mỗi bước; hiếm khi dùng tới, nhưng component
+                           # vài trăm biến cần cỡ 1-2 giây mới đủ mẫu hiệu dụng (ít hơn thì bị bỏ)
 }
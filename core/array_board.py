@@ -0,0 +1,232 @@
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only ArrayBoard needs it
+    np = None
+
+from .board import Board, REVEAL, FLAG
+from .generation import sample_mine_indices_np, adjacency_counts, zero_region_labels
+from .neighbors import neighbor_table, TOP, BOTTOM, LEFT, RIGHT
+
+
+class _CellView:
+    """Read-only Cell look-alike over one position of an ArrayBoard."""
+    __slots__ = ("_b", "_i")
+    def __init__(self, board, i):
+        self._b = board
+        self._i = i
+
+    @property
+    def is_mine(self): return self._b._mine_f[self._i] == 1
+    @property
+    def revealed(self): return self._b._rev_f[self._i] == 1
+    @property
+    def flagged(self): return self._b._flag_f[self._i] == 1
+    @property
+    def adj(self): return self._b._adj_f[self._i]
+
+
+class _RowView:
+    __slots__ = ("_b", "_base")
+    def __init__(self, board, r):
+        self._b = board
+        self._base = r * board.cols
+
+    def __len__(self): return self._b.cols
+    def __getitem__(self, c):
+        if not 0 <= c < self._b.cols: raise IndexError(c)
+        return _CellView(self._b, self._base + c)
+    def __iter__(self):
+        for c in range(self._b.cols):
+            yield _CellView(self._b, self._base + c)
+
+
+class _GridView:
+    """Keeps `board.grid[r][c].<field>` working for code written against Board."""
+    __slots__ = ("_b",)
+    def __init__(self, board):
+        self._b = board
+
+    def __len__(self): return self._b.rows
+    def __getitem__(self, r):
+        if not 0 <= r < self._b.rows: raise IndexError(r)
+        return _RowView(self._b, r)
+    def __iter__(self):
+        for r in range(self._b.rows):
+            yield _RowView(self._b, r)
+
+
+class ArrayBoard(Board):
+    """
+    Board stored as uint8 NumPy planes (mine, revealed, flagged, adj) of shape (rows, cols).
+    Same method API as Board; whole-board queries are vectorized array operations.
+    Scalar access goes through flat memoryviews of the planes, which is much cheaper
+    than indexing the ndarrays element by element.
+    """
+    backend = "array"
+    # from this many cells on, zero regions are opened from precomputed labels instead of BFS
+    REGION_MIN_CELLS = 4096
+    # ...and only for regions of at least REGION_MIN_SIZE cells and 1/REGION_MIN_SHARE of the board
+    REGION_MIN_SIZE = 64
+    REGION_MIN_SHARE = 256
+
+    def __init__(self, rows: int, cols: int, mines: int, debug: bool = False, rng=None):
+        if np is None:
+            raise ImportError("ArrayBoard requires numpy (pip install numpy)")
+        super().__init__(rows, cols, mines, debug=debug, rng=rng)
+
+    def _alloc(self):
+        shape = (self.rows, self.cols)
+        self.mine = np.zeros(shape, dtype=np.uint8)
+        self.revealed = np.zeros(shape, dtype=np.uint8)
+        self.flagged = np.zeros(shape, dtype=np.uint8)
+        self.adj = np.zeros(shape, dtype=np.uint8)
+        self._mine_f = memoryview(self.mine.reshape(-1))
+        self._rev_f = memoryview(self.revealed.reshape(-1))
+        self._flag_f = memoryview(self.flagged.reshape(-1))
+        self._adj_f = memoryview(self.adj.reshape(-1))
+        self._nb = neighbor_table(self.rows, self.cols)
+        self._regions = None  # zero_region_labels(), built lazily on the first zero-cell open
+
+    @property
+    def grid(self): return _GridView(self)
+
+    # ---- helpers
+    def is_revealed(self, r, c): return self._rev_f[r * self.cols + c] == 1
+    def is_flagged(self, r, c): return self._flag_f[r * self.cols + c] == 1
+    def is_mine(self, r, c): return self._mine_f[r * self.cols + c] == 1
+    def adj_mines(self, r, c): return self._adj_f[r * self.cols + c]
+
+    def cell_code(self, r, c):
+        i = r * self.cols + c
+        if self._rev_f[i]: return 2 + self._mine_f[i]
+        return self._flag_f[i]
+
+    def cell_codes(self):
+        return bytearray(np.where(self.revealed, 2 + self.mine, self.flagged).astype(np.uint8).tobytes())
+
+    def numbers_cells(self):
+        rs, cs = np.nonzero(self.revealed & (self.adj > 0))
+        return zip(rs.tolist(), cs.tolist())
+
+    def unknown_cells(self):
+        rs, cs = np.nonzero((self.revealed | self.flagged) == 0)
+        return zip(rs.tolist(), cs.tolist())
+
+    # ---- generation (always safe on first click)
+    def _place_mines_safe(self, safe_r, safe_c):
+        idx = sample_mine_indices_np(self.rows, self.cols, self.mines, safe_r, safe_c,
+                                     self.rng.getrandbits(64))
+        self.mine.reshape(-1)[idx] = 1
+        adjacency_counts(self.mine, out=self.adj)
+        self._regions = None
+
+    # ---- actions
+    def reveal(self, r, c):
+        """Reveal a cell. First ever reveal is guaranteed safe. Returns (hit_mine, any_change)."""
+        if not self.inb(r, c): return (False, False)
+        i = r * self.cols + c
+        if self._rev_f[i] or self._flag_f[i]: return (False, False)
+        if self.recorder: self.recorder(REVEAL, r, c)
+
+        if not self.generated:
+            self._place_mines_safe(r, c)
+            self.generated = True
+            self.first_click = (r, c)
+
+        if self._mine_f[i]:
+            self._rev_f[i] = 1
+            self.changes.append((r, c))
+            return (True, True)
+
+        opened = self._flood_open(r, c)  # cells opened by this click == new tail of self.changes
+        return (False, bool(opened))
+
+    def _flood_open(self, sr, sc):
+        """Open (sr, sc) and, from a zero cell, its zero region plus border. Returns the opened (r, c)."""
+        i = sr * self.cols + sc
+        if self._rev_f[i] or self._flag_f[i]: return []
+        if self._adj_f[i] == 0 and self.rows * self.cols >= self.REGION_MIN_CELLS:
+            opened = self._open_region(i)
+            if opened is not None:
+                return opened
+        return self._bfs_open(i)
+
+    def _bfs_open(self, start):
+        cols = self.cols
+        rev, flag, adj = self._rev_f, self._flag_f, self._adj_f
+        mask, offsets = self._nb.mask, self._nb.offsets
+        q = deque([start])
+        opened = []
+        while q:
+            i = q.popleft()
+            if rev[i] or flag[i]: continue
+            rev[i] = 1
+            opened.append(divmod(i, cols))
+            if adj[i] == 0:
+                for d in offsets[mask[i]]:
+                    j = i + d
+                    if not rev[j] and not flag[j]:
+                        q.append(j)
+        self.opened += len(opened)
+        self.changes.extend(opened)
+        return opened
+
+    def _open_region(self, i):
+        # whole zero region of cell i (labels computed once per layout) + its border, vectorized
+        if self._regions is None:
+            self._regions = zero_region_labels(self.adj, self.mine)
+        labels, cells, offsets = self._regions
+        k = labels[i]
+        region = cells[offsets[k]:offsets[k + 1]]
+        if len(region) < max(self.REGION_MIN_SIZE, self.rows * self.cols // self.REGION_MIN_SHARE):
+            return None  # the mask below costs O(rows * cols): small regions are cheaper by BFS
+        rev, flag = self.revealed.reshape(-1), self.flagged.reshape(-1)
+        if rev[region].any() or flag[region].any():
+            return None  # region cut by flags / earlier opens: BFS keeps the classic semantics
+        edge = np.frombuffer(self._nb.mask, dtype=np.uint8)[region]
+        hit = np.zeros(rev.shape, dtype=bool)
+        hit[region] = True
+        for (dr, dc), d in zip(self._nb.deltas[0], self._nb.offsets[0]):
+            blocked = (TOP if dr < 0 else BOTTOM if dr > 0 else 0) | (LEFT if dc < 0 else RIGHT if dc > 0 else 0)
+            hit[region[(edge & blocked) == 0] + d] = True
+        hit &= (rev | flag) == 0
+        new = np.flatnonzero(hit)
+        rev[new] = 1
+        rs, cs = np.divmod(new, self.cols)
+        opened = list(zip(rs.tolist(), cs.tolist()))
+        self.opened += len(opened)
+        self.changes.extend(opened)
+        return opened
+
+    def toggle_flag(self, r, c):
+        if not self.inb(r, c): return
+        i = r * self.cols + c
+        if self._rev_f[i]: return
+        if self.recorder: self.recorder(FLAG, r, c)
+        self._flag_f[i] ^= 1
+        self.flags += 1 if self._flag_f[i] else -1
+        self.changes.append((r, c))
+
+    def reveal_all_mines(self):
+        rs, cs = np.nonzero(self.mine > self.revealed)
+        self.changes.extend(zip(rs.tolist(), cs.tolist()))
+        self.revealed |= self.mine
+
+    def _pack_cells(self):
+        return (self.adj | self.mine << 4 | self.revealed << 5 | self.flagged << 6).tobytes()
+
+    def _unpack_cells(self, cells):
+        packed = np.frombuffer(cells, dtype=np.uint8).reshape(self.rows, self.cols)
+        self._alloc()
+        np.bitwise_and(packed, 15, out=self.adj)
+        np.bitwise_and(packed >> 4, 1, out=self.mine)
+        np.bitwise_and(packed >> 5, 1, out=self.revealed)
+        np.bitwise_and(packed >> 6, 1, out=self.flagged)
+        rs, cs = np.nonzero(packed & 96)
+        return list(zip(rs.tolist(), cs.tolist()))
+
+    def _count_opened(self):
+        return int(np.count_nonzero(self.revealed > self.mine))
+
@@ -1,37 +1,84 @@
 import random
-from collections import deque
+import struct
+
+from .generation import sample_mine_indices
+from .neighbors import neighbor_table
+
+# action kinds passed to Board.recorder (see core.replay)
+REVEAL = 1
+FLAG = 2
+
+# snapshot header: magic, rows, cols, mines, generated, first click (0xFFFF = none), flags, opened, seed (-1 = none)
+_SNAP = struct.Struct("<4sHHIBHHIIq")
+_SNAP_MAGIC = b"MSB1"
+
+# seeds are kept in 0 .. 2**63 - 1 so they fit the signed 64-bit field of snapshots and replays
+SEED_BITS = 63
+
+
+def normalize_seed(seed):
+    """Fold an int seed into 0 .. 2**63 - 1 (its low 63 bits, so negative seeds work too); None stays None."""
+    return None if seed is None else seed & ((1 << SEED_BITS) - 1)
 
 class Cell:
     __slots__ = ("is_mine", "revealed", "flagged", "adj")
-    def __init__(self):
-        self.is_mine = False
-        self.revealed = False
-        self.flagged = False
-        self.adj = 0
+    def __init__(self, is_mine=False, revealed=False, flagged=False, adj=0):
+        self.is_mine = is_mine
+        self.revealed = revealed
+        self.flagged = flagged
+        self.adj = adj
+
+# packed cell byte -> Cell(...) arguments
+_DECODE = [(b & 16 != 0, b & 32 != 0, b & 64 != 0, b & 15) for b in range(256)]
 
 class Board:
-    def __init__(self, rows: int, cols: int, mines: int):
+    backend = "grid"
+
+    def __init__(self, rows: int, cols: int, mines: int, debug: bool = False, rng=None):
         self.rows = rows
         self.cols = cols
         self.mines = mines
-        self.grid = [[Cell() for _ in range(cols)] for _ in range(rows)]
+        self.debug = debug  # cross-check the opened counter against a full scan
+        self._seed(rng)
+        self._alloc()
         self.generated = False
+        self.first_click = None
         self.flags = 0
+        self.opened = 0  # safe cells revealed so far (maintained by _flood_open)
+        # change log: (r, c) of every cell whose revealed/flagged state changed, in order.
+        # Consumers keep their own read position; reset() starts a new epoch with an empty log.
+        self.changes = []
+        self.epoch = 0
+        # optional callable(kind, r, c) told about every effective reveal/flag (core.replay.GameRecorder)
+        self.recorder = None
+
+    def _alloc(self):
+        # storage hook: subclasses (ArrayBoard) replace the grid of Cell objects
+        self.grid = [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+        self._nb = neighbor_table(self.rows, self.cols)
 
     # ---- helpers
     def inb(self, r, c): return 0 <= r < self.rows and 0 <= c < self.cols
     def neighbors(self, r, c):
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0: continue
-                rr, cc = r + dr, c + dc
-                if self.inb(rr, cc): yield rr, cc
+        # sequence of in-bounds (rr, cc) from the shared per-shape table (core.neighbors)
+        return self._nb.around(r, c)
     def is_revealed(self, r, c): return self.grid[r][c].revealed
     def is_flagged(self, r, c): return self.grid[r][c].flagged
     def is_mine(self, r, c): return self.grid[r][c].is_mine
     def adj_mines(self, r, c): return self.grid[r][c].adj
     def remaining_mines(self): return max(0, self.mines - self.flags)
 
+    # ---- display codes for overview rendering: 0 hidden, 1 flagged, 2 open, 3 revealed mine
+    def cell_code(self, r, c):
+        cell = self.grid[r][c]
+        if cell.revealed: return 3 if cell.is_mine else 2
+        return 1 if cell.flagged else 0
+
+    def cell_codes(self):
+        """Row-major bytearray of cell_code() for every cell."""
+        return bytearray((2 + cell.is_mine) if cell.revealed else cell.flagged
+                         for row in self.grid for cell in row)
+
     def numbers_cells(self):
         for r in range(self.rows):
             for c in range(self.cols):
@@ -46,23 +93,43 @@ class Board:
                 if not cell.revealed and not cell.flagged:
                     yield (r, c)
 
-    def reset(self):
-        self.grid = [[Cell() for _ in range(self.cols)] for _ in range(self.rows)]
+    def _seed(self, rng):
+        # rng: int seed | random.Random | None (seed drawn from the global random module).
+        # A game is identified by (level, seed, first_click); a Random instance has no seed.
+        if isinstance(rng, random.Random):
+            self.seed = None
+            self.rng = rng
+        else:
+            self.seed = random.getrandbits(SEED_BITS) if rng is None else normalize_seed(rng)
+            self.rng = random.Random(self.seed)
+
+    def reset(self, rng=None):
+        """Start a new game. Seeded boards derive the next seed from their own RNG."""
+        if rng is not None:
+            self._seed(rng)
+        elif self.seed is not None:
+            self._seed(self.rng.getrandbits(SEED_BITS))
+        self._alloc()
         self.generated = False
+        self.first_click = None
         self.flags = 0
+        self.opened = 0
+        self.changes = []
+        self.epoch += 1
 
     # ---- generation (always safe on first click)
     def _place_mines_safe(self, safe_r, safe_c):
-        forbidden = {(safe_r, safe_c), *set(self.neighbors(safe_r, safe_c))}
-        pool = [(r, c) for r in range(self.rows) for c in range(self.cols) if (r, c) not in forbidden]
-        mine_positions = random.sample(pool, self.mines)
-        for (r, c) in mine_positions:
-            self.grid[r][c].is_mine = True
-        # compute adj
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c].is_mine: continue
-                self.grid[r][c].adj = sum(1 for (rr, cc) in self.neighbors(r, c) if self.grid[rr][cc].is_mine)
+        cols = self.cols
+        mine_positions = sample_mine_indices(self.rows, cols, self.mines, safe_r, safe_c, self.rng)
+        for i in mine_positions:
+            self.grid[i // cols][i % cols].is_mine = True
+        # compute adj: scatter +1 from each mine instead of scanning every cell
+        grid, mask, deltas = self.grid, self._nb.mask, self._nb.deltas
+        for i in mine_positions:
+            r, c = divmod(i, cols)
+            for dr, dc in deltas[mask[i]]:
+                cell = grid[r + dr][c + dc]
+                if not cell.is_mine: cell.adj += 1
 
     # ---- actions
     def reveal(self, r, c):
@@ -70,50 +137,159 @@ class Board:
         if not self.inb(r, c): return (False, False)
         cell = self.grid[r][c]
         if cell.revealed or cell.flagged: return (False, False)
+        if self.recorder: self.recorder(REVEAL, r, c)
 
         if not self.generated:
             self._place_mines_safe(r, c)
             self.generated = True
+            self.first_click = (r, c)
 
         cell = self.grid[r][c]
         if cell.is_mine:
             cell.revealed = True
+            self.changes.append((r, c))
             return (True, True)
 
-        changed = self._flood_open(r, c)
-        return (False, changed)
+        opened = self._flood_open(r, c)  # cells opened by this click == new tail of self.changes
+        return (False, bool(opened))
 
     def _flood_open(self, sr, sc):
-        if self.grid[sr][sc].revealed: return False
-        q = deque([(sr, sc)])
-        changed = False
-        while q:
-            r, c = q.popleft()
-            cell = self.grid[r][c]
-            if cell.revealed or cell.flagged: continue
+        """
+        Open (sr, sc); from a zero cell, open its whole zero region plus border with a
+        scanline fill (one horizontal span at a time). Returns the list of opened (r, c).
+        """
+        grid, rows, cols = self.grid, self.rows, self.cols
+        cell = grid[sr][sc]
+        if cell.revealed or cell.flagged: return []
+        opened = []
+        if cell.adj:
             cell.revealed = True
-            changed = True
-            if cell.adj == 0:
-                for (rr, cc) in self.neighbors(r, c):
-                    if not self.grid[rr][cc].revealed and not self.grid[rr][cc].flagged:
-                        q.append((rr, cc))
-        return changed
+            opened.append((sr, sc))
+        else:
+            stack = [(sr, sc)]
+            while stack:
+                r, c = stack.pop()
+                row = grid[r]
+                cell = row[c]
+                if cell.revealed or cell.flagged or cell.adj: continue
+                # widen to the maximal span of closed, unflagged zero cells on this row
+                x0 = x1 = c
+                while x0 > 0 and not (row[x0 - 1].adj or row[x0 - 1].revealed or row[x0 - 1].flagged):
+                    x0 -= 1
+                while x1 < cols - 1 and not (row[x1 + 1].adj or row[x1 + 1].revealed or row[x1 + 1].flagged):
+                    x1 += 1
+                lo, hi = max(0, x0 - 1), min(cols - 1, x1 + 1)
+                for x in range(lo, hi + 1):
+                    cell = row[x]
+                    if not cell.revealed and not cell.flagged:
+                        cell.revealed = True
+                        opened.append((r, x))
+                # rows above/below: seed one fill per zero span, open the numbered border
+                for rr in (r - 1, r + 1):
+                    if not 0 <= rr < rows: continue
+                    nrow = grid[rr]
+                    in_span = False
+                    for x in range(lo, hi + 1):
+                        cell = nrow[x]
+                        if cell.revealed or cell.flagged:
+                            in_span = False
+                        elif cell.adj:
+                            cell.revealed = True
+                            opened.append((rr, x))
+                            in_span = False
+                        elif not in_span:
+                            stack.append((rr, x))
+                            in_span = True
+        self.opened += len(opened)
+        self.changes.extend(opened)
+        return opened
 
     def toggle_flag(self, r, c):
         if not self.inb(r, c): return
         cell = self.grid[r][c]
         if cell.revealed: return
+        if self.recorder: self.recorder(FLAG, r, c)
         cell.flagged = not cell.flagged
         self.flags += 1 if cell.flagged else -1
+        self.changes.append((r, c))
 
     def reveal_all_mines(self):
         for r in range(self.rows):
             for c in range(self.cols):
-                if self.grid[r][c].is_mine:
-                    self.grid[r][c].revealed = True
+                cell = self.grid[r][c]
+                if cell.is_mine and not cell.revealed:
+                    cell.revealed = True
+                    self.changes.append((r, c))
+
+    # ---- snapshot / restore: header + 1 byte per cell (bits 0-3 adj, 4 mine, 5 revealed, 6 flagged)
+    def snapshot(self):
+        """Packed copy of the current position (bytes; ~500 bytes for an expert board)."""
+        fr, fc = self.first_click or (0xFFFF, 0xFFFF)
+        head = _SNAP.pack(_SNAP_MAGIC, self.rows, self.cols, self.mines, self.generated, fr, fc,
+                          self.flags, self.opened, -1 if self.seed is None else self.seed)
+        return head + self._pack_cells()
+
+    def restore(self, data):
+        """
+        Load a snapshot() in place (the shape may differ). Starts a new epoch whose change log
+        lists every revealed/flagged cell, so incremental consumers (AI frontier, renderer) rebuild.
+        """
+        magic, rows, cols, mines, generated, fr, fc, flags, opened, seed = _SNAP.unpack_from(data)
+        if magic != _SNAP_MAGIC:
+            raise ValueError("not a board snapshot")
+        cells = memoryview(data)[_SNAP.size:]
+        if len(cells) != rows * cols:
+            raise ValueError(f"snapshot has {len(cells)} cells, expected {rows}x{cols}")
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self._nb = neighbor_table(rows, cols)
+        if seed >= 0:
+            self._seed(seed)  # mines not placed yet -> same layout as the original game
+        else:
+            self.seed = None  # unseeded original: keep this board's rng, stay unidentified
+        self.changes = self._unpack_cells(cells)
+        self.generated = bool(generated)
+        self.first_click = None if fr == 0xFFFF else (fr, fc)
+        self.flags = flags
+        self.opened = opened
+        self.epoch += 1
+
+    @classmethod
+    def from_snapshot(cls, data, **kwargs):
+        # empty 0x0 board first so the grid is allocated only once, by restore()
+        kwargs.setdefault("rng", 0)
+        board = cls(0, 0, _SNAP.unpack_from(data)[3], **kwargs)
+        board.restore(data)
+        return board
+
+    def clone(self):
+        """Independent board at the same position (no recorder; use for lookahead)."""
+        return self.from_snapshot(self.snapshot(), debug=self.debug)
+
+    def _pack_cells(self):
+        return bytes(cell.adj | cell.is_mine << 4 | cell.revealed << 5 | cell.flagged << 6
+                     for row in self.grid for cell in row)
+
+    def _unpack_cells(self, cells):
+        # rebuilds the grid; returns the revealed/flagged cells as the new change log
+        cols, dec = self.cols, _DECODE
+        self.grid = [[Cell(*dec[b]) for b in cells[r * cols:(r + 1) * cols]] for r in range(self.rows)]
+        return [divmod(i, cols) for i, b in enumerate(cells) if b & 96]
 
     def check_win(self):
-        total = self.rows * self.cols - self.mines
-        opened = sum(1 for r in range(self.rows) for c in range(self.cols)
-                     if self.grid[r][c].revealed and not self.grid[r][c].is_mine)
-        return opened == total
+        if self.debug:
+            scanned = self._count_opened()
+            assert scanned == self.opened, f"opened counter {self.opened} != full scan {scanned}"
+        return self.opened == self.rows * self.cols - self.mines
+
+    def _count_opened(self):
+        return sum(1 for r in range(self.rows) for c in range(self.cols)
+                   if self.grid[r][c].revealed and not self.grid[r][c].is_mine)
+
+def make_board(rows, cols, mines, backend="grid", **kwargs):
+    """Create a board with the requested storage backend ("grid" or "array")."""
+    if backend == "array":
+        from .array_board import ArrayBoard
+        return ArrayBoard(rows, cols, mines, **kwargs)
+    if backend != "grid":
+        raise ValueError(f"unknown board backend: {backend!r}")
+    return Board(rows, cols, mines, **kwargs)
@@ -0,0 +1,121 @@
+"""Mine placement helpers shared by Board and ArrayBoard.
+
+Mines are drawn as flat indices over the cells outside the 3x3 safe block of the
+first click: we sample k ranks from range(n_allowed) and shift each rank past the
+forbidden indices (at most 9), so no list of candidate cells is ever built.
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the array helpers need it
+    np = None
+
+
+def forbidden_indices(rows, cols, safe_r, safe_c):
+    """Sorted flat indices of the first click and its in-bounds neighbours."""
+    return [r * cols + c
+            for r in range(max(0, safe_r - 1), min(rows, safe_r + 2))
+            for c in range(max(0, safe_c - 1), min(cols, safe_c + 2))]
+
+
+def sample_mine_indices(rows, cols, mines, safe_r, safe_c, rng=random):
+    """Pick `mines` distinct flat indices avoiding the safe block (pure Python)."""
+    forb = forbidden_indices(rows, cols, safe_r, safe_c)
+    ranks = rng.sample(range(rows * cols - len(forb)), mines)
+    out = []
+    for x in ranks:
+        for f in forb:
+            if x >= f: x += 1
+            else: break
+        out.append(x)
+    return out
+
+
+def sample_mine_indices_np(rows, cols, mines, safe_r, safe_c, seed):
+    """NumPy version of sample_mine_indices; returns an int64 array."""
+    forb = forbidden_indices(rows, cols, safe_r, safe_c)
+    gen = np.random.default_rng(seed)
+    idx = gen.choice(rows * cols - len(forb), size=mines, replace=False)
+    for f in forb:
+        idx[idx >= f] += 1
+    return idx
+
+
+def adjacency_counts(mine, out=None):
+    """
+    Count mines in the 8-neighbourhood of every cell in one convolution-style pass
+    (sum of the 8 shifted views of a zero-padded plane). Mine cells get 0, as in Board.
+    """
+    rows, cols = mine.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = mine
+    if out is None:
+        out = np.zeros((rows, cols), dtype=np.uint8)
+    else:
+        out[...] = 0
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1: continue
+            out += padded[dr:dr + rows, dc:dc + cols]
+    out[mine == 1] = 0
+    return out
+
+
+def zero_region_labels(adj, mine):
+    """
+    Label the 8-connected regions of zero cells (no adjacent mine, not a mine).
+
+    Zero cells are split into horizontal runs; runs in consecutive rows that touch
+    (including diagonally) are merged with a vectorized union-find (hook to the smaller
+    root, then pointer jumping). Returns (labels, cells, offsets):
+      labels   int32 flat array, region id of each cell or -1 for non-zero cells
+      cells    flat indices of all zero cells grouped by region
+      offsets  cells[offsets[k]:offsets[k + 1]] are the cells of region k
+    """
+    rows, cols = adj.shape
+    zero = ((adj == 0) & (mine == 0)).astype(np.int8)
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = zero
+    edges = np.diff(padded, axis=1)
+    run_row, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)  # exclusive
+    n_runs = len(start)
+    labels = np.full(rows * cols, -1, dtype=np.int32)
+    if n_runs == 0:
+        return labels, np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    # runs a (row r) and b (row r+1) touch iff start_b <= end_a and start_a <= end_b
+    width = cols + 2
+    key_start = run_row * width + start
+    key_end = run_row * width + end
+    nxt = (run_row + 1) * width
+    lo = np.searchsorted(key_end, nxt + start, side="left")
+    hi = np.searchsorted(key_start, nxt + end, side="right")
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    a = np.repeat(np.arange(n_runs), counts)
+    b = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+
+    parent = np.arange(n_runs)
+    while total:
+        ra, rb = parent[a], parent[b]
+        if np.array_equal(ra, rb):
+            break
+        low = np.minimum(ra, rb)
+        np.minimum.at(parent, ra, low)
+        np.minimum.at(parent, rb, low)
+        while True:
+            up = parent[parent]
+            if np.array_equal(up, parent):
+                break
+            parent = up
+
+    _, run_label = np.unique(parent, return_inverse=True)
+    cells = np.flatnonzero(zero)  # row-major == runs in order
+    cell_label = np.repeat(run_label.astype(np.int32), end - start)
+    labels[cells] = cell_label
+    order = np.argsort(cell_label, kind="stable")
+    offsets = np.zeros(run_label.max() + 2, dtype=np.int64)
+    np.cumsum(np.bincount(cell_label), out=offsets[1:])
+    return labels, cells[order], offsets
@@ -0,0 +1,66 @@
+"""Precomputed 8-neighbourhood tables, built once per board shape and shared by all boards.
+
+Every cell gets a 4-bit edge mask (top row, bottom row, left column, right column); the
+neighbours of a cell are then a fixed offset list for its mask, so hot loops do
+`for d in offsets[mask[i]]: j = i + d` with no bounds checks and no allocation.
+Small shapes also keep a ready-made tuple of (r, c) neighbours per cell for the
+coordinate API (Board.neighbors).
+"""
+
+TOP, BOTTOM, LEFT, RIGHT = 1, 2, 4, 8
+
+# above this many cells the per-cell (r, c) tuples cost too much memory; build them on demand
+RC_TABLE_LIMIT = 1 << 16
+
+
+class NeighborTable:
+    """
+    mask[i]       edge mask of flat cell i = r * cols + c
+    offsets[m]    flat index offsets of the in-bounds neighbours for edge mask m
+    deltas[m]     the same neighbours as (dr, dc) pairs
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        n = rows * cols
+        mask = bytearray(n)
+        if n:
+            mask[:cols] = bytes([TOP]) * cols
+            last = (rows - 1) * cols
+            mask[last:] = bytes(m | BOTTOM for m in mask[last:])
+            mask[0::cols] = bytes(m | LEFT for m in mask[0::cols])
+            mask[cols - 1::cols] = bytes(m | RIGHT for m in mask[cols - 1::cols])
+        self.mask = mask
+
+        self.deltas = []
+        self.offsets = []
+        for m in range(16):
+            ds = tuple((dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                       if (dr or dc)
+                       and not (dr < 0 and m & TOP) and not (dr > 0 and m & BOTTOM)
+                       and not (dc < 0 and m & LEFT) and not (dc > 0 and m & RIGHT))
+            self.deltas.append(ds)
+            self.offsets.append(tuple(dr * cols + dc for dr, dc in ds))
+
+        self._rc = None
+        if n <= RC_TABLE_LIMIT:
+            coords = [divmod(i, cols) for i in range(n)]
+            self._rc = [tuple(coords[i + d] for d in self.offsets[mask[i]]) for i in range(n)]
+
+    def around(self, r, c):
+        """In-bounds neighbours of (r, c) as a sequence of (rr, cc)."""
+        i = r * self.cols + c
+        if self._rc is not None:
+            return self._rc[i]
+        return [(r + dr, c + dc) for dr, dc in self.deltas[self.mask[i]]]
+
+
+_TABLES = {}
+
+def neighbor_table(rows, cols):
+    """Shared NeighborTable for a board shape (built on first use)."""
+    table = _TABLES.get((rows, cols))
+    if table is None:
+        table = _TABLES[(rows, cols)] = NeighborTable(rows, cols)
+    return table
@@ -0,0 +1,254 @@
+"""Compact binary game log: record every game as (header, actions) and replay it on a Board.
+
+File layout (little-endian), appendable while streaming and read back through mmap:
+
+    file header   "MSRP" u16 version u16 reserved                         8 bytes
+    game header   u8 'G'  8s level  u8 backend  u16 rows  u16 cols  u32 mines  i64 seed
+    action        u8 kind  u16 r  u16 c  u32 t_ms (ms since the game's first action)  9 bytes
+    end           u8 END   u16 result  u16 0  u32 t_ms                              9 bytes
+
+A game is fully determined by its header and action list: the Board is rebuilt from
+(rows, cols, mines, seed, backend) and mines are placed on the first reveal, which is also
+the game's first click. Seeds are stored as Board.seed (normalize_seed(), 0 .. 2**63 - 1),
+the same signed field as Board.snapshot(). The end record is optional (aborted games have none).
+"""
+import io
+import mmap
+import os
+import struct
+import time
+from dataclasses import dataclass
+
+from .board import REVEAL, FLAG, make_board, normalize_seed
+
+MAGIC = b"MSRP"
+VERSION = 1
+END = 0xFF
+GAME = ord("G")
+
+# results stored in the end record
+ABORTED, WON, LOST = 0, 1, 2
+
+_FILE = struct.Struct("<4sHH")
+_GAME = struct.Struct("<B8sBHHIq")
+_ACTION = struct.Struct("<BHHI")
+_BACKENDS = ("grid", "array")
+
+
+class ReplayWriter:
+    """
+    Append games to a replay file (path) or any binary file object (e.g. io.BytesIO).
+    The file header is written when the target is empty; appending to an existing
+    file checks its header instead.
+    """
+
+    def __init__(self, target):
+        self._own = isinstance(target, (str, os.PathLike))
+        self._f = open(target, "a+b") if self._own else target
+        self._f.seek(0, io.SEEK_END)
+        if self._f.tell() == 0:
+            self._f.write(_FILE.pack(MAGIC, VERSION, 0))
+        elif self._own:
+            self._f.seek(0)
+            _check_header(self._f.read(_FILE.size))
+            self._f.seek(0, io.SEEK_END)
+
+    def begin_game(self, level_key, rows, cols, mines, seed, backend="grid"):
+        if seed is None:
+            raise ValueError("only seeded boards can be recorded (Board(..., rng=int))")
+        self._f.write(_GAME.pack(GAME, str(level_key).encode("ascii"), _BACKENDS.index(backend),
+                                 rows, cols, mines, normalize_seed(seed)))
+
+    def action(self, kind, r, c, t_ms=0):
+        self._f.write(_ACTION.pack(kind, r, c, t_ms))
+
+    def end_game(self, result, t_ms=0):
+        self._f.write(_ACTION.pack(END, result, 0, t_ms))
+
+    def extend(self, data):
+        """Append the games of another writer's output (bytes including its file header)."""
+        _check_header(data[:_FILE.size])
+        self._f.write(memoryview(data)[_FILE.size:])
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        if self._own:
+            self._f.close()
+        else:
+            self._f.flush()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+
+class GameRecorder:
+    """
+    Board.recorder hook: streams every effective reveal/flag of `board` into a ReplayWriter.
+    A new game header is written on the first action after each reset (new board.epoch).
+    """
+
+    def __init__(self, writer, board, level_key):
+        self.writer = writer
+        self.board = board
+        self.level_key = level_key
+        self._epoch = None
+        self._t0 = 0.0
+        self._ended = False
+        self._muted = False
+        board.recorder = self
+
+    def _ms(self):
+        return int((time.perf_counter() - self._t0) * 1000)
+
+    def __call__(self, kind, r, c):
+        b = self.board
+        if b.epoch != self._epoch:
+            self._epoch = b.epoch
+            self._t0 = time.perf_counter()
+            self._ended = False
+            self._muted = False
+            self.writer.begin_game(self.level_key, b.rows, b.cols, b.mines, b.seed, b.backend)
+        elif self._muted:
+            return
+        self.writer.action(kind, r, c, self._ms())
+
+    def finish(self, result):
+        """Write the end record of the current game (once; no-op if nothing was played)."""
+        if self._epoch == self.board.epoch and not self._ended:
+            self.writer.end_game(result, self._ms())
+            self._ended = True
+
+    def mute(self):
+        """
+        Stop recording the board's current epoch, e.g. after Board.restore(): a restored
+        position is not reachable by replaying actions from the seed. Recording resumes
+        with the next game (next reset).
+        """
+        self._epoch = self.board.epoch
+        self._ended = True
+        self._muted = True
+
+    def detach(self):
+        self.board.recorder = None
+        self.writer.flush()
+
+
+@dataclass
+class GameRecord:
+    level_key: str
+    backend: str
+    rows: int
+    cols: int
+    mines: int
+    seed: int
+    result: int
+    data: bytes  # packed action records (without the end record)
+
+    def __len__(self):
+        return len(self.data) // _ACTION.size
+
+    def actions(self):
+        """Iterate (kind, r, c, t_ms) in play order."""
+        return _ACTION.iter_unpack(self.data)
+
+    @property
+    def first_click(self):
+        for kind, r, c, _ in self.actions():
+            if kind == REVEAL:
+                return (r, c)
+        return None
+
+
+class ReplayReader:
+    """
+    Memory-mapped reader. Opening scans the records once to build an offset index, after
+    which any game is one slice of the map: reader[i] -> GameRecord.
+    """
+
+    def __init__(self, path):
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        _check_header(self._f.read(_FILE.size))
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size > _FILE.size else b""
+        self._index = self._scan(size)
+
+    def _scan(self, size):
+        mm = self._mm
+        index = []  # (header offset, actions start, actions end, result)
+        off = _FILE.size
+        hdr = start = stop = None
+        result = ABORTED
+        while off < size:
+            tag = mm[off]
+            if tag == GAME:
+                if off + _GAME.size > size:
+                    break  # truncated tail of a file still being written
+                if hdr is not None:
+                    index.append((hdr, start, stop or off, result))
+                hdr, start, stop, result = off, off + _GAME.size, None, ABORTED
+                off = start
+            elif tag in (REVEAL, FLAG, END):
+                if hdr is None:
+                    raise ValueError(f"action record before any game header at offset {off}")
+                if off + _ACTION.size > size:
+                    break  # truncated tail of a file still being written
+                if tag == END:
+                    result = struct.unpack_from("<H", mm, off + 1)[0]
+                    stop = off
+                off += _ACTION.size
+            else:
+                raise ValueError(f"bad record tag {tag:#x} at offset {off}")
+        if hdr is not None:
+            index.append((hdr, start, stop or off, result))
+        return index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, i):
+        hdr, start, end, result = self._index[i]
+        _, level, backend, rows, cols, mines, seed = _GAME.unpack_from(self._mm, hdr)
+        return GameRecord(level.rstrip(b"\0").decode("ascii"), _BACKENDS[backend],
+                          rows, cols, mines, seed, result, self._mm[start:end])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+
+def _check_header(raw):
+    if len(raw) < _FILE.size:
+        raise ValueError("not a replay file (too short)")
+    magic, version, _ = _FILE.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("not a replay file (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"unsupported replay version {version}")
+
+
+def apply_actions(board, actions, upto=None):
+    """Apply (kind, r, c, t_ms) actions to `board`; stop after `upto` actions (None = all)."""
+    for n, (kind, r, c, _) in enumerate(actions):
+        if upto is not None and n >= upto:
+            break
+        if kind == REVEAL:
+            board.reveal(r, c)
+        elif kind == FLAG:
+            board.toggle_flag(r, c)
+    return board
+
+
+def replay(record, upto=None):
+    """Rebuild the position of `record` after its first `upto` actions (None = final position)."""
+    board = make_board(record.rows, record.cols, record.mines, record.backend, rng=record.seed)
+    return apply_actions(board, record.actions(), upto)
@@ -1,5 +1,6 @@
 import os
 import sys
+from collections import deque
 import pygame
 
 # Ensure package imports when running as script
@@ -7,22 +8,45 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
-from config import LEVELS, COLORS, TILE, HUD, AI as AI_CFG, FACE
-from core.board import Board
+from config import LEVELS, HUD, AI as AI_CFG, FACE, BOARD, VIEW, REPLAY
+from core.board import make_board
 from core.timer import GameTimer
+from core.replay import ReplayWriter, GameRecorder, WON, LOST, ABORTED
 from core.game_state import GameMode, GameStatus, GamePhase, GameState
-from ui.display import draw_board, draw_menu, draw_face_button, compute_window_size, face_button_rect
-from ui.hud import draw_hud
+from ui.display import draw_menu, compute_window_size, face_button_rect, init_fonts
 from ui.events import pos_to_cell
+from ui.renderer import BoardRenderer
+from ui.camera import Camera
 from ai.ai import MinesweeperAI
-from ui.display import draw_board, draw_menu, draw_face_button, compute_window_size, face_button_rect
+from ai.cache import ComponentCache
+from ai.autoplay import apply_step, play_turbo
+from ai.worker import AIWorker
 
 
 pygame.init()
 pygame.display.set_caption("Minesweeper")
+init_fonts()
+
+def make_camera(screen, rows, cols):
+    # viewport = toàn bộ cửa sổ dưới HUD
+    view = (0, HUD["height"], screen.get_width(), screen.get_height() - HUD["height"])
+    return Camera(rows, cols, view)
+
+def make_ai(cache):
+    return MinesweeperAI(cache=cache, mc_samples=AI_CFG["mc_samples"], mc_budget_ms=AI_CFG["mc_budget_ms"])
+
+def open_replay_log():
+    if not REPLAY["path"]:
+        return None
+    path = os.path.join(BASE_DIR, REPLAY["path"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return ReplayWriter(path)
 
 def run_game():
     clock = pygame.time.Clock()
+    replay_log = open_replay_log()
+    # cache bảng đếm component dùng chung cho mọi ván trong phiên
+    ai_cache = ComponentCache(AI_CFG["cache_size"]) if AI_CFG["cache_size"] else None
 
     # -------- MENU LOOP --------
     level_key, mode = show_menu(clock)
@@ -32,24 +56,31 @@ def run_game():
     rows, cols, mines = cfg["rows"], cfg["cols"], cfg["mines"]
     window_w, window_h = compute_window_size(rows, cols)
     screen = pygame.display.set_mode((window_w, window_h))
+    camera = make_camera(screen, rows, cols)
 
-    board = Board(rows, cols, mines)
+    board = make_board(rows, cols, mines, BOARD["backend"], debug=BOARD["debug"])
+    recorder = GameRecorder(replay_log, board, level_key) if replay_log else None
     timer = GameTimer()
     state = GameState(level_key=level_key, mode=mode)
-    ai = MinesweeperAI() if mode == GameMode.AI else None
+    # AI suy luận trên thread nền; vòng lặp chính chỉ áp dụng kết quả và vẽ
+    ai = make_ai(ai_cache) if mode == GameMode.AI else None
+    worker = AIWorker(ai) if ai and AI_CFG["policy"] != "turbo" else None  # turbo chạy ngay trong frame
     ai_started = False
     face = FACE["neutral"]
+    renderer = BoardRenderer()
+    undo = deque(maxlen=BOARD["undo_depth"])  # Board.snapshot() trước mỗi click (Player)
 
     last_ai_step = 0
 
     running = True
     while running:
         dt = clock.tick(60)
-        screen.fill(COLORS["bg"])
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
 
             # Keyboard shortcuts
             if event.type == pygame.KEYDOWN:
@@ -57,7 +88,9 @@ def run_game():
                     running = False
                 if event.key == pygame.K_r:
                     # restart current game quickly
+                    if worker: worker.cancel()
                     board.reset()
+                    undo.clear()
                     timer.reset()
                     state.reset_for_restart()
                     ai_started = False
@@ -69,12 +102,39 @@ def run_game():
                     rows, cols, mines = cfg["rows"], cfg["cols"], cfg["mines"]
                     window_w, window_h = compute_window_size(rows, cols)
                     screen = pygame.display.set_mode((window_w, window_h))
-                    board = Board(rows, cols, mines)
+                    camera = make_camera(screen, rows, cols)
+                    renderer.invalidate()
+                    board = make_board(rows, cols, mines, BOARD["backend"], debug=BOARD["debug"])
+                    recorder = GameRecorder(replay_log, board, level_key) if replay_log else None
+                    undo.clear()
                     timer = GameTimer()
                     state = GameState(level_key=level_key, mode=mode)
-                    ai = MinesweeperAI() if mode == GameMode.AI else None
+                    if worker: worker.close()
+                    ai = make_ai(ai_cache) if mode == GameMode.AI else None
+                    worker = AIWorker(ai) if ai and AI_CFG["policy"] != "turbo" else None
                     ai_started = False
                     face = FACE["neutral"]
+                if event.key == pygame.K_u and state.mode == GameMode.PLAYER and undo:
+                    # undo last click (kể cả sau khi thua); ván này không ghi replay tiếp
+                    if recorder: recorder.finish(ABORTED)
+                    board.restore(undo.pop())
+                    if recorder: recorder.mute()
+                    state.status = GameStatus.PLAYING
+                    face = FACE["neutral"]
+                    if board.generated:
+                        timer.start()
+                    else:
+                        timer.reset(); state.reset_for_restart()
+                if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                    camera.zoom(1)
+                if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    camera.zoom(-1)
+
+            # Viewport: wheel = zoom quanh con trỏ, kéo chuột giữa = cuộn
+            if event.type == pygame.MOUSEWHEEL:
+                camera.zoom(event.y, pygame.mouse.get_pos())
+            if event.type == pygame.MOUSEMOTION and event.buttons[1]:
+                camera.pan(*event.rel)
 
             # Mouse in-game
             if state.phase == GamePhase.PLAYING and state.status == GameStatus.PLAYING:
@@ -82,12 +142,17 @@ def run_game():
                     mx, my = event.pos
 
                     if face_button_rect(screen.get_width()).collidepoint(mx, my):
-                        board.reset(); timer.reset(); state.reset_for_restart()
+                        if worker: worker.cancel()
+                        board.reset(); timer.reset(); state.reset_for_restart(); undo.clear()
                         ai_started = False; face = FACE["neutral"]; continue
 
-                    cell = pos_to_cell(mx, my, rows, cols)
+                    if worker and worker.pending: continue  # AI đang đọc bàn -> bỏ qua click lên bàn
+                    cell = pos_to_cell(mx, my, rows, cols, camera)
                     if cell is None: continue
                     r, c = cell
+                    if state.mode == GameMode.PLAYER and event.button in (1, 3) and not board.is_revealed(r, c) \
+                            and (event.button == 3 or not board.is_flagged(r, c)):
+                        undo.append(board.snapshot())
 
                     if event.button == 1:
                         if not state.first_click:
@@ -107,50 +172,50 @@ def run_game():
                         if board.check_win():
                             state.status = GameStatus.WON; timer.stop(); face = FACE["win"]
 
+        # Arrow keys scroll the viewport while held
+        keys = pygame.key.get_pressed()
+        dx = keys[pygame.K_LEFT] - keys[pygame.K_RIGHT]
+        dy = keys[pygame.K_UP] - keys[pygame.K_DOWN]
+        if dx or dy:
+            camera.pan(dx * VIEW["pan_px"], dy * VIEW["pan_px"])
+
         # -------- AI AUTOPLAY --------
         if state.mode == GameMode.AI and ai_started and state.status == GameStatus.PLAYING:
             last_ai_step += dt
-            if last_ai_step >= AI_CFG["step_ms"]:
-                last_ai_step = 0
-                # Run one AI step (may include multiple safe reveals/flags)
-                actions = ai.next_actions(board)
-                any_change = False
-
-                # Apply flags first
-                for (rr, cc) in actions["flags"]:
-                    if not board.is_revealed(rr, cc) and not board.is_flagged(rr, cc):
-                        board.toggle_flag(rr, cc)
-                        any_change = True
-
-                # Apply reveals
-                for (rr, cc) in actions["reveal"]:
-                    if not state.first_click:
-                        state.first_click = True; timer.start()
-                    hit_mine, changed = board.reveal(rr, cc)  # <-- safe-first đã qua
-                    any_change = any_change or changed
-                    if hit_mine:
-                        state.status = GameStatus.LOST; timer.stop(); face = FACE["lost"]; board.reveal_all_mines(); break
-
-                # If no deterministic actions, AI guesses 1 cell
-                if state.status == GameStatus.PLAYING and not any_change:
-                    guess = ai.guess(board)
-                    if guess:
-                        rr, cc = guess
-                        hit_mine, _ = board.reveal(rr, cc)  # <-- gọi đơn giản
-                        if hit_mine:
-                            state.status = GameStatus.LOST; timer.stop(); face = FACE["lost"]; board.reveal_all_mines()
+            hit_mine = None
+            if worker is None:
+                # turbo: many AI steps within the frame budget, only the final state is drawn
+                hit_mine, _, _ = play_turbo(board, ai, AI_CFG["turbo_budget_ms"])
+            else:
+                plan = worker.poll()
+                if plan is not None:
+                    # Apply one AI step (may include multiple safe reveals/flags, or 1 guess)
+                    hit_mine, _, _ = apply_step(board, *plan)
+            if hit_mine is not None:
+                if hit_mine:
+                    state.status = GameStatus.LOST; timer.stop(); face = FACE["lost"]; board.reveal_all_mines()
 
                 if state.status == GameStatus.PLAYING and board.check_win():
                     state.status = GameStatus.WON
                     timer.stop()
                     face = FACE["win"]
 
-        # -------- DRAW --------
-        draw_hud(screen, board, timer, state, face)
-        draw_board(screen, board, state)
+            paced = AI_CFG["policy"] != "max"
+            if worker and state.status == GameStatus.PLAYING and not worker.pending and \
+                    (not paced or last_ai_step >= AI_CFG["step_ms"]):
+                last_ai_step = 0
+                worker.request(board)
 
-        pygame.display.flip()
+        if recorder and state.status != GameStatus.PLAYING:
+            recorder.finish(WON if state.status == GameStatus.WON else LOST)  # 1 lần mỗi ván
+
+        # -------- DRAW (only dirty tiles / HUD) --------
+        rects = renderer.draw(screen, board, timer, state, face, camera)
+        if rects:
+            pygame.display.update(rects)
 
+    if worker: worker.close()
+    if replay_log: replay_log.close()
     pygame.quit()
 
 def show_menu(clock):
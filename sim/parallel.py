@@ -0,0 +1,82 @@
+"""
+Multi-process self-play. Each level is split into fixed-size chunks of games; every chunk
+runs in a pool worker and sends back one LevelStats aggregate instead of per-game results.
+
+Every game carries its own seed (game_seed(seed, level, index)) for both Board and
+MinesweeperAI, so a run is reproducible whether it uses 1 process or all cores.
+With a replay log, each chunk records into memory and the parent appends the chunks in
+order, so the log holds the same games and actions for any worker count (only the
+timestamps differ).
+With a component cache file (ai.cache), every process loads it once and each chunk sends
+back the entries it added; the parent merges them and saves the file at the end.
+"""
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.replay import ReplayWriter
+from ai.cache import ComponentCache
+from .runner import LevelStats, run_level
+
+_CACHES = {}
+
+
+def process_cache(path):
+    """The ComponentCache of this process for `path` (loaded from the file on first use, if it exists)."""
+    cache = _CACHES.get(path)
+    if cache is None:
+        cache = _CACHES[path] = ComponentCache.load(path) if os.path.exists(path) else ComponentCache()
+    return cache
+
+
+def _run_chunk(task):
+    level_key, games, start, seed, first_click, backend, record, profile, cache_path = task
+    cache = process_cache(cache_path) if cache_path else None
+    buf = io.BytesIO() if record else None
+    writer = ReplayWriter(buf) if record else None
+    stats = run_level(level_key, games, first_click, backend, seed, start, writer, profile, cache)
+    return stats, buf.getvalue() if record else None, cache.take_new() if cache else None
+
+
+def _tasks(level_key, games, seed, chunk, first_click, backend, record=False, profile=False, cache=None):
+    return [(level_key, min(chunk, games - start), start, seed, first_click, backend, record, profile, cache)
+            for start in range(0, games, chunk)]
+
+
+def run_parallel(levels, games, workers=None, seed=0, chunk=50, first_click="center", backend="grid",
+                 record=None, profile=False, cache=None):
+    """
+    Play `games` games on each level using `workers` processes (None/0 -> os.cpu_count(),
+    1 -> in-process). Returns a list of LevelStats, one per level.
+    record: path of a replay log to append every game to (core.replay format).
+    profile: collect ai.stats.AIStats per level (merged across chunks into LevelStats.ai_stats).
+    cache: path of an ai.cache.ComponentCache JSON file to start from and save to.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    writer = ReplayWriter(record) if record else None
+    shared = process_cache(cache) if cache else None
+    try:
+        for level_key in levels:
+            tasks = _tasks(level_key, games, seed, chunk, first_click, backend, bool(record), profile, cache)
+            t0 = time.perf_counter()
+            parts = pool.map(_run_chunk, tasks) if pool else map(_run_chunk, tasks)
+            stats = LevelStats(level_key)
+            for part, data, entries in parts:
+                stats.merge(part)
+                if writer:
+                    writer.extend(data)
+                if shared is not None:
+                    shared.update(entries)
+            stats.wall = time.perf_counter() - t0
+            results.append(stats)
+    finally:
+        if pool:
+            pool.shutdown()
+        if writer:
+            writer.close()
+        if shared is not None:
+            shared.save(cache)
+    return results
@@ -0,0 +1,221 @@
+"""
+Headless AI self-play: plays N games per level from config.LEVELS without pygame.
+
+    python -m sim --levels 1,5 --games 1000
+    python -m sim --games 100000 --workers 0 --seed 7   # all cores, reproducible
+    python -m sim --replay 5:1234567890:8,15             # replay one game (level:seed[:r,c])
+    python -m sim --games 100000 --workers 0 --record games.msrp   # store every game (core.replay)
+    python -m sim --levels 5 --games 500 --stats ai_stats.json     # per-phase AI profile (ai.stats)
+    python -m sim --games 1000 --workers 0 --cache counts.json     # warm component cache (ai.cache)
+
+Every game is identified by (level, seed, first click) for a given board backend: its Board
+and MinesweeperAI are seeded from the game seed, derived from (base seed, level, game index).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from config import LEVELS
+from core.board import make_board
+from core.replay import GameRecorder, WON, LOST
+from ai.ai import MinesweeperAI
+from ai.autoplay import play_step
+from ai.stats import AIStats
+
+
+@dataclass
+class GameResult:
+    won: bool
+    steps: int
+    guesses: int
+    seconds: float
+    seed: int = None
+    first_click: tuple = None
+
+
+@dataclass
+class LevelStats:
+    level_key: str
+    games: int = 0
+    wins: int = 0
+    steps: int = 0
+    guesses: int = 0
+    seconds: float = 0.0
+    wall: float = 0.0  # thời gian thực của cả lô (gồm overhead)
+    slowest: tuple = None  # (seconds, seed, first_click) của ván chậm nhất, để replay
+    ai_stats: AIStats = None  # chỉ có khi chạy với --stats
+
+    def add(self, res):
+        self.games += 1
+        self.wins += res.won
+        self.steps += res.steps
+        self.guesses += res.guesses
+        self.seconds += res.seconds
+        if self.slowest is None or res.seconds > self.slowest[0]:
+            self.slowest = (res.seconds, res.seed, res.first_click)
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.steps += other.steps
+        self.guesses += other.guesses
+        self.seconds += other.seconds
+        if other.slowest is not None and (self.slowest is None or other.slowest[0] > self.slowest[0]):
+            self.slowest = other.slowest
+        if other.ai_stats is not None:
+            self.ai_stats = (self.ai_stats or AIStats()).merge(other.ai_stats)
+
+    @property
+    def win_rate(self): return self.wins / self.games if self.games else 0.0
+    @property
+    def guesses_per_game(self): return self.guesses / self.games if self.games else 0.0
+    @property
+    def steps_per_game(self): return self.steps / self.games if self.games else 0.0
+    @property
+    def ms_per_game(self): return 1000.0 * self.seconds / self.games if self.games else 0.0
+    @property
+    def games_per_sec(self):
+        t = self.wall or self.seconds
+        return self.games / t if t > 0 else 0.0
+
+
+def game_seed(seed, level_key, index):
+    # random.Random(str) băm bằng sha512 -> ổn định giữa các lần chạy (không phụ thuộc PYTHONHASHSEED)
+    return random.Random(f"{seed}:{level_key}:{index}").getrandbits(63)
+
+
+def first_click_cell(rows, cols, first_click="center", seed=None):
+    if first_click == "random":
+        rng = random.Random(seed)
+        return (rng.randrange(rows), rng.randrange(cols))
+    if first_click == "center":
+        return (rows // 2, cols // 2)
+    return tuple(first_click)
+
+
+def play_game(level_key, seed=None, first_click="center", backend="grid", ai=None, writer=None,
+              stats=None, cache=None):
+    """
+    Play one AI game to the end; returns a GameResult. Same (level, seed, first click) -> same game.
+    With a core.replay.ReplayWriter every action of the game is appended to it; with an
+    ai.stats.AIStats the AI's per-phase profile is added to it; an ai.cache.ComponentCache is
+    shared with the AI (results are the same with or without it).
+    """
+    cfg = LEVELS[level_key]
+    rows, cols, mines = cfg["rows"], cfg["cols"], cfg["mines"]
+    board = make_board(rows, cols, mines, backend, rng=seed)
+    recorder = GameRecorder(writer, board, level_key) if writer else None
+    ai = ai or MinesweeperAI(rng=board.seed, stats=stats, cache=cache)
+    click = first_click_cell(rows, cols, first_click, board.seed)
+
+    t0 = time.perf_counter()
+    steps = guesses = 0
+    won = False
+    hit_mine, _ = board.reveal(*click)
+    while not hit_mine:
+        if board.check_win():
+            won = True
+            break
+        hit_mine, changed, guessed = play_step(board, ai)
+        steps += 1
+        guesses += guessed
+        if not changed and not guessed:
+            break  # không còn nước đi (không nên xảy ra)
+    if recorder:
+        recorder.finish(WON if won else LOST)
+    return GameResult(won, steps, guesses, time.perf_counter() - t0, board.seed, click)
+
+
+def run_level(level_key, games, first_click="center", backend="grid", seed=0, start=0, writer=None,
+              profile=False, cache=None):
+    """
+    Play games start..start+games-1 of one level (seeded by game_seed); returns LevelStats.
+    profile=True also collects the AI's per-phase stats into LevelStats.ai_stats.
+    """
+    stats = LevelStats(level_key, ai_stats=AIStats() if profile else None)
+    t0 = time.perf_counter()
+    for i in range(start, start + games):
+        stats.add(play_game(level_key, game_seed(seed, level_key, i), first_click, backend,
+                            writer=writer, stats=stats.ai_stats, cache=cache))
+    stats.wall = time.perf_counter() - t0
+    return stats
+
+
+def print_report(all_stats, out=sys.stdout):
+    out.write(f"{'level':>5} {'games':>8} {'win %':>7} {'guess/g':>8} {'steps/g':>8} "
+              f"{'ms/game':>9} {'games/s':>9}\n")
+    for st in all_stats:
+        out.write(f"{st.level_key:>5} {st.games:>8} {100 * st.win_rate:>7.2f} {st.guesses_per_game:>8.2f} "
+                  f"{st.steps_per_game:>8.1f} {st.ms_per_game:>9.2f} {st.games_per_sec:>9.1f}\n")
+    for st in all_stats:
+        if st.slowest is not None:
+            secs, seed, (r, c) = st.slowest
+            out.write(f"slowest level {st.level_key}: {secs * 1000:.1f} ms  "
+                      f"(--replay {st.level_key}:{seed}:{r},{c})\n")
+    for st in all_stats:
+        if st.ai_stats is not None:
+            out.write(f"AI profile level {st.level_key}: {st.ai_stats.report()}\n")
+
+
+def save_ai_stats(all_stats, path):
+    """Write {level: AIStats.to_dict()} as JSON (load with AIStats.from_dict, combine with merge)."""
+    data = {st.level_key: st.ai_stats.to_dict() for st in all_stats if st.ai_stats is not None}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="Headless Minesweeper AI self-play")
+    ap.add_argument("--levels", default=",".join(LEVELS), help="comma-separated level keys (default: all)")
+    ap.add_argument("--games", type=int, default=100, help="games per level")
+    ap.add_argument("--first-click", default="center", choices=("center", "random"))
+    ap.add_argument("--backend", default="grid", choices=("grid", "array"))
+    ap.add_argument("--workers", type=int, default=1, help="processes (0 = all cores, 1 = in-process)")
+    ap.add_argument("--seed", type=int, default=0, help="base seed; every game is seeded from (seed, level, game index)")
+    ap.add_argument("--chunk", type=int, default=50, help="games per worker task")
+    ap.add_argument("--replay", metavar="LEVEL:SEED[:R,C]", help="play a single game and print its result")
+    ap.add_argument("--record", metavar="PATH", help="append every game to a binary replay log")
+    ap.add_argument("--stats", metavar="PATH", help="profile the AI per phase and write the stats as JSON")
+    ap.add_argument("--cache", metavar="PATH",
+                    help="component count cache: loaded at start if the file exists, saved at the end")
+    return ap
+
+
+def replay(spec, backend="grid"):
+    parts = spec.split(":")
+    level_key, seed = parts[0], int(parts[1])
+    first_click = tuple(int(x) for x in parts[2].split(",")) if len(parts) > 2 else "center"
+    res = play_game(level_key, seed, first_click, backend)
+    print(f"level {level_key} seed {seed} first click {res.first_click}: "
+          f"{'won' if res.won else 'lost'} in {res.steps} steps, {res.guesses} guesses, "
+          f"{res.seconds * 1000:.1f} ms")
+    return res
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.replay:
+        replay(args.replay, args.backend)
+        return
+    levels = [k.strip() for k in args.levels.split(",") if k.strip()]
+    for k in levels:
+        if k not in LEVELS:
+            raise SystemExit(f"unknown level {k!r}; choose from {', '.join(LEVELS)}")
+    from .parallel import run_parallel
+    all_stats = run_parallel(levels, args.games, args.workers, args.seed, args.chunk,
+                             args.first_click, args.backend, args.record, bool(args.stats), args.cache)
+    print_report(all_stats)
+    if args.stats:
+        save_ai_stats(all_stats, args.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+The MCMC sampler (ai.sampling) on a component of a few hundred cells, where sequential
+sampling never finished a solution. The band is narrow enough for the exact DP, whose
+marginals are the reference.
+
+    python -m pytest tests
+"""
+import random
+import unittest
+
+from ai.ai import MinesweeperAI
+from ai.counting import solve_component
+from ai.sampling import sample_component
+from core.board import make_board
+
+
+def band_constraints(cols, seed, rows=8, density=0.2, share=0.35):
+    """
+    Constraints of a band position: a random share of the safe cells of a rows x cols board is
+    revealed (no flood fill), so the numbers chain into long components. Cells forced by a full
+    or empty constraint are filled in (repeatedly, as the AI does before counting); returns
+    (n, constraints) of the largest remaining component, over its cells numbered 0..n-1.
+    """
+    board = make_board(rows, cols, int(rows * cols * density), rng=seed)
+    board._place_mines_safe(0, 0)
+    rng = random.Random(seed)
+    revealed = {(r, c) for r in range(rows) for c in range(cols)
+                if not board.is_mine(r, c) and rng.random() < share}
+    constraints = []
+    for r, c in sorted(revealed):
+        unknown = {cell for cell in board.neighbors(r, c) if cell not in revealed}
+        if unknown:
+            constraints.append((unknown, board.adj_mines(r, c)))
+
+    while True:
+        forced = {cell: int(t > 0) for vs, t in constraints if t in (0, len(vs)) for cell in vs}
+        if not forced:
+            break
+        constraints = [(vs - forced.keys(), t - sum(forced.get(cell, 0) for cell in vs))
+                       for vs, t in constraints]
+        constraints = [(vs, t) for vs, t in constraints if vs]
+
+    # largest connected component
+    owner = {}
+    groups = []
+    for vs, t in constraints:
+        merged = {owner[cell] for cell in vs if cell in owner}
+        group = [(vs, t)]
+        for g in merged:
+            group += groups[g]
+            groups[g] = []
+        for cell in {cell for cs, _ in group for cell in cs}:
+            owner[cell] = len(groups)
+        groups.append(group)
+    best = max(groups, key=lambda g: len({cell for vs, _ in g for cell in vs}))
+    index = {}
+    return len({cell for vs, _ in best for cell in vs}), \
+        [([index.setdefault(cell, len(index)) for cell in sorted(vs)], t) for vs, t in best]
+
+
+class SampleComponentTest(unittest.TestCase):
+    def test_large_component_is_gated_in(self):
+        n, constraints = band_constraints(200, seed=3)
+        self.assertGreaterEqual(n, 200)
+        total, mines = solve_component(n, constraints).marginals()
+        exact = [m / total for m in mines]
+
+        sc = sample_component(n, constraints, random.Random(1), max_samples=200)
+        self.assertGreaterEqual(sc.ess(), MinesweeperAI().mc_min_ess)
+        z, counts = sc.marginals()
+        est = [m / z for m in counts]
+        self.assertLess(max(abs(a - b) for a, b in zip(est, exact)), 0.25)
+        self.assertLess(sum(abs(a - b) for a, b in zip(est, exact)) / n, 0.05)
+        covered = sum(lo <= p <= hi for p, (lo, hi) in zip(exact, sc.intervals()))
+        self.assertGreaterEqual(covered / n, 0.85)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import pygame
+from config import TILE, VIEW
+
+
+def tile_gap(size):
+    # khe giữa các ô co giãn theo cỡ ô; overview vẽ liền (không khe)
+    if size < VIEW["overview_px"]:
+        return 0
+    return round(TILE["gap"] * size / TILE["size"])
+
+
+class Camera:
+    """
+    Viewport over the board: current tile size (zoom) and the screen position (ox, oy) of the
+    board's top-left corner. A board smaller than the view is centered; a larger one can be
+    scrolled and is always clamped so it covers the view.
+    """
+
+    def __init__(self, rows, cols, view, size=None):
+        self.rows = rows
+        self.cols = cols
+        self.view = pygame.Rect(view)
+        self.size = size if size is not None else self._fit_size()
+        self.ox = self.oy = 0
+        self.center_on(rows / 2, cols / 2)
+
+    def _fit_size(self):
+        # cỡ ô lớn nhất (không quá TILE["size"]) để thấy cả bàn; bàn quá lớn -> mức zoom nhỏ nhất
+        levels = [s for s in VIEW["zoom_levels"] if s <= TILE["size"]]
+        for s in reversed(levels):
+            g = tile_gap(s)
+            if self.cols * (s + g) + g <= self.view.w and self.rows * (s + g) + g <= self.view.h:
+                return s
+        return levels[0]
+
+    @property
+    def gap(self): return tile_gap(self.size)
+    @property
+    def step(self): return self.size + self.gap
+    @property
+    def overview(self): return self.size < VIEW["overview_px"]
+
+    def board_size(self):
+        g, step = self.gap, self.step
+        return (self.cols * step + g, self.rows * step + g)
+
+    def key(self):
+        # đổi key -> renderer phải vẽ lại toàn bộ viewport
+        return (self.ox, self.oy, self.size, tuple(self.view))
+
+    def clamp(self):
+        bw, bh = self.board_size()
+        v = self.view
+        if bw <= v.w:
+            self.ox = v.x + (v.w - bw) // 2
+        else:
+            self.ox = min(v.x, max(v.right - bw, self.ox))
+        if bh <= v.h:
+            self.oy = v.y + (v.h - bh) // 2
+        else:
+            self.oy = min(v.y, max(v.bottom - bh, self.oy))
+
+    def center_on(self, r, c):
+        self.ox = self.view.centerx - int(c * self.step)
+        self.oy = self.view.centery - int(r * self.step)
+        self.clamp()
+
+    def pan(self, dx, dy):
+        """Move the board by (dx, dy) screen pixels (drag direction)."""
+        self.ox += int(dx)
+        self.oy += int(dy)
+        self.clamp()
+
+    def zoom(self, steps, anchor=None):
+        """Go `steps` zoom levels in (>0) or out (<0), keeping the point under `anchor` fixed."""
+        levels = VIEW["zoom_levels"]
+        i = min(range(len(levels)), key=lambda k: abs(levels[k] - self.size))
+        size = levels[max(0, min(len(levels) - 1, i + steps))]
+        if size == self.size:
+            return False
+        ax, ay = anchor if anchor is not None else self.view.center
+        fx = (ax - self.ox) / self.step
+        fy = (ay - self.oy) / self.step
+        self.size = size
+        self.ox = ax - int(fx * self.step)
+        self.oy = ay - int(fy * self.step)
+        self.clamp()
+        return True
+
+    def tile_rect(self, r, c):
+        g, step = self.gap, self.step
+        return pygame.Rect(self.ox + g + c * step, self.oy + g + r * step, self.size, self.size)
+
+    def visible_cells(self):
+        """(r0, r1, c0, c1): half-open range of rows/cols that intersect the view."""
+        step, v = self.step, self.view
+        r0 = max(0, (v.y - self.oy) // step)
+        r1 = min(self.rows, (v.bottom - self.oy) // step + 1)
+        c0 = max(0, (v.x - self.ox) // step)
+        c1 = min(self.cols, (v.right - self.ox) // step + 1)
+        return r0, max(r0, r1), c0, max(c0, c1)
+
+    def cell_at(self, mx, my):
+        """(r, c) under screen point (mx, my), or None outside the view/board or in a gap."""
+        if not self.view.collidepoint(mx, my):
+            return None
+        g, step = self.gap, self.step
+        rel_x = mx - self.ox - g
+        rel_y = my - self.oy - g
+        if rel_x < 0 or rel_y < 0:
+            return None
+        if rel_x % step >= self.size or rel_y % step >= self.size:
+            return None
+        row, col = rel_y // step, rel_x // step
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return (int(row), int(col))
+        return None
@@ -1,5 +1,7 @@
+from functools import lru_cache
+
 import pygame
-from config import TILE, HUD, COLORS, FACE
+from config import TILE, HUD, COLORS, FACE, VIEW
 
 # -------- Fonts (Ưu tiên Segoe UI cho tiếng Việt)
 _UI_FONT_NAMES = ["segoe ui", "arial", "tahoma", "dejavu sans", "noto sans"]
@@ -11,21 +13,34 @@ def _match_font():
     return None
 
 _FONT_PATH = None
-def get_font(px, bold=False):
-    global _FONT_PATH
-    if _FONT_PATH is None:
+_FONT_SCANNED = False
+def init_fonts():
+    # dò font hệ thống đúng 1 lần (kể cả khi không tìm thấy -> dùng SysFont mặc định)
+    global _FONT_PATH, _FONT_SCANNED
+    if not _FONT_SCANNED:
         _FONT_PATH = _match_font()
+        _FONT_SCANNED = True
+
+@lru_cache(maxsize=32)
+def get_font(px, bold=False):
+    init_fonts()
     if _FONT_PATH:
         f = pygame.font.Font(_FONT_PATH, px)
         f.set_bold(bold)
         return f
     return pygame.font.SysFont(None, px, bold=bold)
 
+@lru_cache(maxsize=256)
+def render_text(text, px, color, bold=False):
+    # Surface dùng chung giữa các frame: chỉ blit, không vẽ đè lên
+    return get_font(px, bold).render(text, True, color)
+
 def compute_window_size(rows, cols):
     board_w = cols * (TILE["size"] + TILE["gap"]) + TILE["gap"]
     board_h = rows * (TILE["size"] + TILE["gap"]) + TILE["gap"]
-    w = max(board_w, 540)
-    h = HUD["height"] + board_h
+    # bàn lớn hơn VIEW["max_w"/"max_h"] thì cửa sổ bị chặn lại và dùng Camera để cuộn/zoom
+    w = min(max(board_w, 540), VIEW["max_w"])
+    h = HUD["height"] + min(board_h, VIEW["max_h"] - HUD["height"])
     return (w, h)
 
 def board_origin(rows, cols, screen_w):
@@ -81,7 +96,123 @@ def draw_face_button(surface, face_char):
     mood = "neutral" if face_char == FACE["neutral"] else ("lost" if face_char == FACE["lost"] else "win")
     _draw_smiley(surface, face_button_rect(surface.get_width()), mood)
 
-def draw_board(surface, board, state):
+def tile_rect(ox, oy, r, c):
+    x = ox + TILE["gap"] + c*(TILE["size"]+TILE["gap"])
+    y = oy + TILE["gap"] + r*(TILE["size"]+TILE["gap"])
+    return pygame.Rect(x, y, TILE["size"], TILE["size"])
+
+# -------- Tile atlas: sprite cho mọi trạng thái ô, dựng 1 lần cho mỗi cấu hình TILE/COLORS và cỡ ô
+class TileAtlas:
+    def __init__(self, size=None):
+        size = size or TILE["size"]
+        k = size / TILE["size"]  # tỉ lệ so với cỡ gốc (zoom); k=1 -> y hệt sprite gốc
+        def px(v, lo=0): return max(lo, round(v * k))
+        font = get_font(px(TILE["font_px"], 6), bold=True)
+        rect = pygame.Rect(0, 0, size, size)
+        radius = px(6)
+
+        def base(color):
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, rect, border_radius=radius)
+            pygame.draw.rect(surf, COLORS["border"], rect, 1, border_radius=radius)
+            return surf
+
+        self.hidden = base(COLORS["tile"])
+        # vẽ cờ đơn giản (tam giác)
+        self.flag = base(COLORS["tile"])
+        p1 = (rect.centerx, rect.top + px(6))
+        p2 = (rect.centerx, rect.top + rect.height//2)
+        p3 = (rect.centerx + rect.width//3, rect.top + rect.height//3)
+        pygame.draw.polygon(self.flag, (220,40,40), [p1, p2, p3])
+        pygame.draw.line(self.flag, (35,35,35), (rect.centerx, rect.top+px(4)),
+                         (rect.centerx, rect.bottom-px(6)), px(2, 1))
+
+        # ô mở xen kẽ 2 màu theo (r+c)%2: numbers[p][0] = ô trống, numbers[p][n] = số n
+        self.numbers = []
+        self.mine = []
+        for color in (COLORS["tile_open"], COLORS["tile_open_alt"]):
+            row = [base(color)]
+            for n in range(1, 9):
+                surf = base(color)
+                img = font.render(str(n), True, COLORS["number"][n])
+                surf.blit(img, img.get_rect(center=rect.center))
+                row.append(surf)
+            self.numbers.append(row)
+            surf = base(color)
+            pygame.draw.circle(surf, (20,20,20), rect.center, size//3)
+            pygame.draw.circle(surf, (255,70,70), rect.center, size//3, px(3, 1))
+            self.mine.append(surf)
+
+        if pygame.display.get_surface() is not None:
+            self.hidden = self.hidden.convert_alpha()
+            self.flag = self.flag.convert_alpha()
+            self.numbers = [[s.convert_alpha() for s in row] for row in self.numbers]
+            self.mine = [s.convert_alpha() for s in self.mine]
+
+    def sprite(self, cell, r, c):
+        if cell.revealed:
+            if cell.is_mine:
+                return self.mine[(r+c) % 2]
+            return self.numbers[(r+c) % 2][cell.adj]
+        return self.flag if cell.flagged else self.hidden
+
+_ATLASES = {}
+def get_atlas(size=None):
+    # mỗi cỡ ô (mức zoom) 1 atlas; dựng lại khi kích thước ô / font / màu đổi
+    size = size or TILE["size"]
+    key = (size, TILE["size"], TILE["font_px"], COLORS["tile"], COLORS["tile_open"], COLORS["tile_open_alt"],
+           COLORS["border"], tuple(sorted(COLORS["number"].items())))
+    atlas = _ATLASES.get(key)
+    if atlas is None:
+        if len(_ATLASES) >= 16:
+            _ATLASES.clear()
+        atlas = _ATLASES[key] = TileAtlas(size)
+    return atlas
+
+# -------- Overview: 1 pixel/ô (mã từ board.cell_codes()), phóng lên theo zoom.
+# Dựng lại khi bàn/epoch đổi, còn lại chỉ cập nhật các ô trong board.changes.
+class BoardOverview:
+    def __init__(self):
+        self._board = None
+        self._epoch = None
+        self._log_pos = 0
+        self._codes = None
+        self.surface = None
+
+    def sync(self, board):
+        if board is not self._board or board.epoch != self._epoch:
+            self._board = board
+            self._epoch = board.epoch
+            self._codes = board.cell_codes()
+            # surface 8-bit dùng chung bộ nhớ với self._codes: sửa byte là đổi pixel
+            self.surface = pygame.image.frombuffer(self._codes, (board.cols, board.rows), "P")
+            self.surface.set_palette([COLORS["tile"], COLORS["flag"], COLORS["tile_open"], COLORS["mine"]])
+            self._log_pos = len(board.changes)
+            return self.surface
+        log = board.changes
+        if self._log_pos < len(log):
+            codes, cols = self._codes, board.cols
+            for (r, c) in log[self._log_pos:]:
+                codes[r * cols + c] = board.cell_code(r, c)
+            self._log_pos = len(log)
+        return self.surface
+
+    def draw(self, surface, board, camera):
+        src = self.sync(board)
+        r0, r1, c0, c1 = camera.visible_cells()
+        if r1 <= r0 or c1 <= c0:
+            return
+        step = camera.step
+        part = src.subsurface((c0, r0, c1 - c0, r1 - r0))
+        part = pygame.transform.scale(part, ((c1 - c0) * step, (r1 - r0) * step))
+        surface.blit(part, (camera.ox + c0 * step, camera.oy + r0 * step))
+
+_OVERVIEW = BoardOverview()
+
+def draw_board(surface, board, state, camera=None):
+    if camera is not None:
+        draw_board_view(surface, board, camera)
+        return
     rows, cols = board.rows, board.cols
     ox, oy = board_origin(rows, cols, surface.get_width())
 
@@ -89,36 +220,39 @@ def draw_board(surface, board, state):
     board_h = rows * (TILE["size"] + TILE["gap"]) + TILE["gap"]
     pygame.draw.rect(surface, COLORS["grid_bg"], (ox, oy, board_w, board_h), border_radius=8)
 
-    font = get_font(TILE["font_px"], bold=True)
-
-    for r in range(rows):
-        for c in range(cols):
-            x = ox + TILE["gap"] + c*(TILE["size"]+TILE["gap"])
-            y = oy + TILE["gap"] + r*(TILE["size"]+TILE["gap"])
-            rect = pygame.Rect(x, y, TILE["size"], TILE["size"])
-            cell = board.grid[r][c]
-
-            if cell.revealed:
-                base = COLORS["tile_open"] if (r+c)%2==0 else COLORS["tile_open_alt"]
-                pygame.draw.rect(surface, base, rect, border_radius=6)
-                pygame.draw.rect(surface, COLORS["border"], rect, 1, border_radius=6)
-                if cell.is_mine:
-                    pygame.draw.circle(surface, (20,20,20), rect.center, TILE["size"]//3)
-                    pygame.draw.circle(surface, (255,70,70), rect.center, TILE["size"]//3, 3)
-                elif cell.adj > 0:
-                    color = COLORS["number"][cell.adj]
-                    img = font.render(str(cell.adj), True, color)
-                    surface.blit(img, img.get_rect(center=rect.center))
-            else:
-                pygame.draw.rect(surface, COLORS["tile"], rect, border_radius=6)
-                pygame.draw.rect(surface, COLORS["border"], rect, 1, border_radius=6)
-                if cell.flagged:
-                    # vẽ cờ đơn giản (tam giác)
-                    p1 = (rect.centerx, rect.top + 6)
-                    p2 = (rect.centerx, rect.top + rect.height//2)
-                    p3 = (rect.centerx + rect.width//3, rect.top + rect.height//3)
-                    pygame.draw.polygon(surface, (220,40,40), [p1, p2, p3])
-                    pygame.draw.line(surface, (35,35,35), (rect.centerx, rect.top+4), (rect.centerx, rect.bottom-6), 2)
+    atlas = get_atlas()
+    step = TILE["size"] + TILE["gap"]
+    blits = []
+    for r, row in enumerate(board.grid):
+        y = oy + TILE["gap"] + r*step
+        for c, cell in enumerate(row):
+            blits.append((atlas.sprite(cell, r, c), (ox + TILE["gap"] + c*step, y)))
+    surface.blits(blits, doreturn=False)
+
+def draw_board_view(surface, board, camera):
+    # chỉ vẽ các ô nằm trong camera.view; zoom quá nhỏ -> overview thay cho sprite
+    view = camera.view
+    clip = surface.get_clip()
+    surface.set_clip(view)
+    surface.fill(COLORS["bg"], view)
+    if camera.overview:
+        _OVERVIEW.draw(surface, board, camera)
+    else:
+        bw, bh = camera.board_size()
+        pygame.draw.rect(surface, COLORS["grid_bg"], (camera.ox, camera.oy, bw, bh), border_radius=8)
+        atlas = get_atlas(camera.size)
+        r0, r1, c0, c1 = camera.visible_cells()
+        step = camera.step
+        x0 = camera.ox + camera.gap
+        grid = board.grid
+        blits = []
+        for r in range(r0, r1):
+            row = grid[r]
+            y = camera.oy + camera.gap + r*step
+            for c in range(c0, c1):
+                blits.append((atlas.sprite(row[c], r, c), (x0 + c*step, y)))
+        surface.blits(blits, doreturn=False)
+    surface.set_clip(clip)
 
 def draw_menu(surface, phase="level", return_click=False, mouse=None):
     surface.fill((24,24,24))
@@ -126,25 +260,22 @@ def draw_menu(surface, phase="level", return_click=False, mouse=None):
     sub1 = "Chọn Level (1–5)"
     sub2 = "Sau đó chọn Chế độ: Player hoặc AI"
 
-    font_title = get_font(56, bold=True)
-    font_sub = get_font(24)
-
     center_x = surface.get_width() // 2
     y = 40
-    img = font_title.render(title, True, (235,235,235))
+    img = render_text(title, 56, (235,235,235), bold=True)
     surface.blit(img, img.get_rect(midtop=(center_x, y)))
     y += 80
 
     if phase == "level":
-        surface.blit(font_sub.render(sub1, True, (200,200,200)),
-                     font_sub.render(sub1, True, (200,200,200)).get_rect(midtop=(center_x, y)))
+        img = render_text(sub1, 24, (200,200,200))
+        surface.blit(img, img.get_rect(midtop=(center_x, y)))
         y += 50
         btns = []
         for i in range(1,6):
             rect = pygame.Rect(center_x - 240 + (i-1)*120, y, 90, 62)
             pygame.draw.rect(surface, (80,80,80), rect, border_radius=12)
             pygame.draw.rect(surface, (30,30,30), rect, 2, border_radius=12)
-            txt = get_font(32, bold=True).render(str(i), True, (245,245,245))
+            txt = render_text(str(i), 32, (245,245,245), bold=True)
             surface.blit(txt, txt.get_rect(center=rect.center))
             btns.append((str(i), rect))
         if return_click and mouse:
@@ -152,15 +283,15 @@ def draw_menu(surface, phase="level", return_click=False, mouse=None):
             for key, rect in btns:
                 if rect.collidepoint(mx, my): return key
     else:
-        surface.blit(font_sub.render(sub2, True, (200,200,200)),
-                     font_sub.render(sub2, True, (200,200,200)).get_rect(midtop=(center_x, y)))
+        img = render_text(sub2, 24, (200,200,200))
+        surface.blit(img, img.get_rect(midtop=(center_x, y)))
         y += 56
         player_rect = pygame.Rect(center_x - 170, y, 150, 62)
         ai_rect     = pygame.Rect(center_x + 20,  y, 150, 62)
         for rect, label in [(player_rect, "Player"), (ai_rect, "AI")]:
             pygame.draw.rect(surface, (80,80,80), rect, border_radius=12)
             pygame.draw.rect(surface, (30,30,30), rect, 2, border_radius=12)
-            txt = get_font(28, bold=True).render(label, True, (245,245,245))
+            txt = render_text(label, 28, (245,245,245), bold=True)
             surface.blit(txt, txt.get_rect(center=rect.center))
         if return_click and mouse:
             mx, my = mouse
@@ -1,7 +1,10 @@
 from config import TILE, HUD
 
-def pos_to_cell(mx, my, rows, cols):
+def pos_to_cell(mx, my, rows, cols, camera=None):
     # Convert mouse position to (r,c) on board; returns None if outside board
+    # With a Camera (scroll/zoom viewport) the camera knows the board origin and tile size
+    if camera is not None:
+        return camera.cell_at(mx, my)
     # Board is centered horizontally; we recompute origin same as display.py
     board_w = cols * (TILE["size"] + TILE["gap"]) + TILE["gap"]
     ox = (max(board_w, 420) - board_w) // 2  # this only works if screen width == compute_window_size(...)[0]
@@ -0,0 +1,99 @@
+import pygame
+from config import HUD, COLORS
+from .display import draw_board, tile_rect, board_origin, get_atlas
+from .hud import draw_hud
+
+# Quá nhiều rect nhỏ thì gộp thành 1 rect bao (display.update với list dài cũng tốn)
+_MAX_RECTS = 256
+
+
+class BoardRenderer:
+    """
+    Dirty-rectangle renderer: vẽ lại toàn bộ chỉ khi cần (bàn mới, reset, invalidate),
+    còn lại chỉ vẽ các ô trong board.changes kể từ frame trước và HUD khi nội dung đổi.
+    Với camera: cuộn/zoom -> vẽ lại cả viewport; ô đổi nằm ngoài viewport thì bỏ qua.
+    draw() trả về list rect để đưa vào pygame.display.update(rects); rỗng nếu không có gì đổi.
+    """
+
+    def __init__(self):
+        self._board = None
+        self._epoch = None
+        self._log_pos = 0
+        self._hud_key = None
+        self._view_key = None
+        self._full = True
+
+    def invalidate(self):
+        # gọi khi surface bị thay (set_mode) hoặc cửa sổ cần vẽ lại
+        self._full = True
+
+    def draw(self, surface, board, timer, state, face, camera=None):
+        if board is not self._board or board.epoch != self._epoch:
+            self._board = board
+            self._epoch = board.epoch
+            self._full = True
+
+        hud_key = (board.remaining_mines(), timer.seconds(), face, surface.get_width())
+        if self._full:
+            surface.fill(COLORS["bg"])
+            draw_hud(surface, board, timer, state, face)
+            draw_board(surface, board, state, camera)
+            self._hud_key = hud_key
+            self._view_key = camera.key() if camera else None
+            self._log_pos = len(board.changes)
+            self._full = False
+            return [surface.get_rect()]
+
+        rects = []
+        if hud_key != self._hud_key:
+            draw_hud(surface, board, timer, state, face)
+            self._hud_key = hud_key
+            rects.append(pygame.Rect(0, 0, surface.get_width(), HUD["height"]))
+
+        log = board.changes
+        if camera is not None and (camera.key() != self._view_key or
+                                   (camera.overview and self._log_pos < len(log))):
+            # viewport dịch/zoom (hoặc overview có ô đổi): vẽ lại đúng vùng viewport
+            draw_board(surface, board, state, camera)
+            self._view_key = camera.key()
+            self._log_pos = len(log)
+            rects.append(camera.view.copy())
+        elif camera is not None and self._log_pos < len(log):
+            dirty = set(log[self._log_pos:])
+            self._log_pos = len(log)
+            r0, r1, c0, c1 = camera.visible_cells()
+            atlas = get_atlas(camera.size)
+            grid = board.grid
+            view = camera.view
+            tiles = []
+            blits = []
+            for (r, c) in dirty:
+                if r0 <= r < r1 and c0 <= c < c1:
+                    rect = camera.tile_rect(r, c)
+                    blits.append((atlas.sprite(grid[r][c], r, c), rect))
+                    tiles.append(rect.clip(view))
+            clip = surface.get_clip()
+            surface.set_clip(view)  # ô ở mép viewport chỉ hiện 1 phần, không đè lên HUD
+            surface.blits(blits, doreturn=False)
+            surface.set_clip(clip)
+            if len(tiles) > _MAX_RECTS:
+                tiles = [tiles[0].unionall(tiles)]
+            rects.extend(tiles)
+        elif self._log_pos < len(log):
+            dirty = set(log[self._log_pos:])
+            self._log_pos = len(log)
+            ox, oy = board_origin(board.rows, board.cols, surface.get_width())
+            atlas = get_atlas()
+            grid = board.grid
+            tiles = []
+            blits = []
+            for (r, c) in dirty:
+                # mọi sprite ô đều phủ cùng 1 hình chữ nhật bo góc -> blit đè lên là đủ
+                rect = tile_rect(ox, oy, r, c)
+                blits.append((atlas.sprite(grid[r][c], r, c), rect))
+                tiles.append(rect)
+            surface.blits(blits, doreturn=False)
+            if len(tiles) > _MAX_RECTS:
+                tiles = [tiles[0].unionall(tiles)]
+            rects.extend(tiles)
+        return rects